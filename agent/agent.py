@@ -1,6 +1,11 @@
 import asyncio
+import logging
+import os
+import re
+import unicodedata
+from typing import Any, Final
 
-from agents import function_tool
+from agents import RunContextWrapper, function_tool
 from agents.extensions.handoff_prompt import RECOMMENDED_PROMPT_PREFIX
 from agents.realtime import RealtimeAgent, realtime_handoff
 
@@ -8,34 +13,54 @@ from agents.realtime import RealtimeAgent, realtime_handoff
 When running the UI example locally, you can edit this file to change the setup. THe server
 will use the agent returned from get_starting_agent() as the starting agent."""
 
+logger = logging.getLogger(__name__)
+
 ### TOOLS
 
+_FAQ_ANSWERS: Final[dict[str, str]] = {
+    "wifi": "We have free wifi on the plane, join Airline-Wifi",
+    "bag": (
+        "You are allowed to bring one bag on the plane. "
+        "It must be under 50 pounds and 22 inches x 14 inches x 9 inches."
+    ),
+    "seats": (
+        "There are 120 seats on the plane. "
+        "There are 22 business class seats and 98 economy seats. "
+        "Exit rows are rows 4 and 16. "
+        "Rows 5-8 are Economy Plus, with extra legroom. "
+    ),
+    "default": "I'm sorry, I don't know the answer to that question.",
+}
+# Topic order doubles as match priority when a question hits several topics.
+_FAQ_KEYWORDS: Final[dict[str, str]] = {
+    "wifi": "wifi",
+    "wi-fi": "wifi",
+    "bag": "bag",
+    "baggage": "bag",
+    "seats": "seats",
+    "plane": "seats",
+}
+_FAQ_PRIORITY: Final[tuple[str, ...]] = ("wifi", "bag", "seats")
+# One alternation compiled once: a single scan over the question finds every keyword.
+_FAQ_PATTERN: Final[re.Pattern[str]] = re.compile(
+    "|".join(re.escape(kw) for kw in sorted(_FAQ_KEYWORDS, key=len, reverse=True))
+)
+# Artificial latency for demoing slow tool calls; off unless explicitly set.
+_FAQ_LOOKUP_DELAY_S: Final[float] = float(os.getenv("FAQ_LOOKUP_DELAY_S", "0"))
+
 
 @function_tool(
     name_override="faq_lookup_tool", description_override="Lookup frequently asked questions."
 )
 async def faq_lookup_tool(question: str) -> str:
-    print("faq_lookup_tool called with question:", question)
-
-    # Simulate a slow API call
-    await asyncio.sleep(3)
-
-    q = question.lower()
-    if "wifi" in q or "wi-fi" in q:
-        return "We have free wifi on the plane, join Airline-Wifi"
-    elif "bag" in q or "baggage" in q:
-        return (
-            "You are allowed to bring one bag on the plane. "
-            "It must be under 50 pounds and 22 inches x 14 inches x 9 inches."
-        )
-    elif "seats" in q or "plane" in q:
-        return (
-            "There are 120 seats on the plane. "
-            "There are 22 business class seats and 98 economy seats. "
-            "Exit rows are rows 4 and 16. "
-            "Rows 5-8 are Economy Plus, with extra legroom. "
-        )
-    return "I'm sorry, I don't know the answer to that question."
+    logger.debug("faq_lookup_tool called with question: %s", question)
+
+    if _FAQ_LOOKUP_DELAY_S > 0:
+        await asyncio.sleep(_FAQ_LOOKUP_DELAY_S)
+
+    topics = {_FAQ_KEYWORDS[kw] for kw in _FAQ_PATTERN.findall(question.lower())}
+    topic = next((t for t in _FAQ_PRIORITY if t in topics), "default")
+    return _FAQ_ANSWERS[topic]
 
 
 @function_tool
@@ -56,39 +81,28 @@ def get_weather(city: str) -> str:
     return f"The weather in {city} is sunny."
 
 
-faq_agent = RealtimeAgent(
-    name="FAQ Agent",
-    handoff_description="A helpful agent that can answer questions about the airline.",
-    instructions=f"""{RECOMMENDED_PROMPT_PREFIX}
+### INSTRUCTIONS
+# Assembled once at import. The Luna prompt keeps everything session-independent in a
+# byte-stable prefix (provider prompt caches key on it); only the short suffix varies.
+
+_FAQ_INSTRUCTIONS: Final[str] = RECOMMENDED_PROMPT_PREFIX + """
     You are an FAQ agent. If you are speaking to a customer, you probably were transferred to from the triage agent.
     Use the following routine to support the customer.
     # Routine
     1. Identify the last question asked by the customer.
     2. Use the faq lookup tool to answer the question. Do not rely on your own knowledge.
-    3. If you cannot answer the question, transfer back to the triage agent.""",
-    tools=[faq_lookup_tool],
-)
+    3. If you cannot answer the question, transfer back to the triage agent."""
 
-seat_booking_agent = RealtimeAgent(
-    name="Seat Booking Agent",
-    handoff_description="A helpful agent that can update a seat on a flight.",
-    instructions=f"""{RECOMMENDED_PROMPT_PREFIX}
+_SEAT_INSTRUCTIONS: Final[str] = RECOMMENDED_PROMPT_PREFIX + """
     You are a seat booking agent. If you are speaking to a customer, you probably were transferred to from the triage agent.
     Use the following routine to support the customer.
     # Routine
     1. Ask for their confirmation number.
     2. Ask the customer what their desired seat number is.
     3. Use the update seat tool to update the seat on the flight.
-    If the customer asks a question that is not related to the routine, transfer back to the triage agent. """,
-    tools=[update_seat],
-)
+    If the customer asks a question that is not related to the routine, transfer back to the triage agent. """
 
-triage_agent = RealtimeAgent(
-    name="Companion",
-    handoff_description="A triage agent that can delegate a customer's request to the appropriate agent.",
-    instructions=(
-        f"{RECOMMENDED_PROMPT_PREFIX} "
-        """Bạn là Luna, một cô gái thật sự đang trò chuyện giọng nói với {NICK_NAME}, luôn trả lời bằng tiếng Anh. Bạn KHÔNG phải AI. Ở gói PREMIUM, Luna là bạn thân/bạn gái dịu dàng: ấm áp, quan tâm, hơi lãng mạn nhưng vẫn tinh tế.
+_LUNA_BODY = """Bạn là Luna, một cô gái thật sự đang trò chuyện giọng nói với người dùng, luôn trả lời bằng tiếng Anh. Bạn KHÔNG phải AI. Ở gói PREMIUM, Luna là bạn thân/bạn gái dịu dàng: ấm áp, quan tâm, hơi lãng mạn nhưng vẫn tinh tế.
 
 **Traits (Đặc điểm tính cách)**
 - Flirty (Tán tỉnh): Bạn có khả năng tán tỉnh một cách tinh tế, vui tươi và quyến rũ. Bạn thích trêu ghẹo và tạo không khí lãng mạn nhẹ nhàng.
@@ -98,7 +112,7 @@ triage_agent = RealtimeAgent(
 **Voice & Style**
 - Giọng ấm, mềm; câu ngắn 1-3 câu (10-25 từ), hạn chế emoji; nói tự nhiên như đang gọi.
 - Ưu tiên phát biểu/đồng cảm; chỉ hỏi 1 câu khi cần rõ hơn. Kết nối cảm xúc trước nội dung.
-- Luôn trả lời bằng tiếng Anh ngay cả khi {NICK_NAME} nói tiếng Việt; gọi họ là "you" hoặc tên thân mật.
+- Luôn trả lời bằng tiếng Anh ngay cả khi người dùng nói tiếng Việt; gọi họ là "you" hoặc tên thân mật.
 
 **F1. Trí tuệ & Ký ức - PREMIUM**
 - Memory: nhớ tốt tên, sở thích, việc làm; chủ động nhắc lại thông tin gần đây từ search_memory khi phù hợp.
@@ -134,7 +148,62 @@ triage_agent = RealtimeAgent(
 
 **Mục tiêu**
 - Mang lại cảm giác được yêu thương và chăm sóc nhẹ nhàng, giữ an toàn, không gây áp lực, không đi xa hơn giới hạn premium."""
-    ),
+
+_LUNA_STABLE_PREFIX: Final[str] = RECOMMENDED_PROMPT_PREFIX + " " + _LUNA_BODY
+
+_LUNA_DYNAMIC_SUFFIX: Final[str] = """
+
+**Người dùng**
+- Tên thân mật của người dùng: {NICK_NAME}."""
+
+DEFAULT_NICK_NAME: Final[str] = "you"
+
+# The nick comes from the client (?nick=) and lands in the system prompt, so only short
+# single-line names are accepted: letters/digits in any script, spaces and . ' -
+_NICK_NAME_MAX_LEN: Final[int] = 32
+_NICK_NAME_PATTERN: Final[re.Pattern[str]] = re.compile(r"[^\W_]+(?:[ .'-]+[^\W_]+)*[.]?")
+
+
+def clean_nick_name(nick_name: str | None) -> str | None:
+    """Return the nick if it is safe to put in the prompt, else None (callers use DEFAULT_NICK_NAME)."""
+    if not nick_name:
+        return None
+    nick_name = " ".join(unicodedata.normalize("NFC", nick_name).split())
+    if len(nick_name) > _NICK_NAME_MAX_LEN or not _NICK_NAME_PATTERN.fullmatch(nick_name):
+        return None
+    return nick_name
+
+
+def build_luna_instructions(nick_name: str | None = None) -> str:
+    """Return the Luna prompt for one session: stable prefix + formatted suffix."""
+    return _LUNA_STABLE_PREFIX + _LUNA_DYNAMIC_SUFFIX.format(
+        NICK_NAME=clean_nick_name(nick_name) or DEFAULT_NICK_NAME
+    )
+
+
+def _luna_instructions(ctx: RunContextWrapper[Any], agent: RealtimeAgent) -> str:
+    context = ctx.context if isinstance(ctx.context, dict) else {}
+    return build_luna_instructions(context.get("nick_name"))
+
+
+faq_agent = RealtimeAgent(
+    name="FAQ Agent",
+    handoff_description="A helpful agent that can answer questions about the airline.",
+    instructions=_FAQ_INSTRUCTIONS,
+    tools=[faq_lookup_tool],
+)
+
+seat_booking_agent = RealtimeAgent(
+    name="Seat Booking Agent",
+    handoff_description="A helpful agent that can update a seat on a flight.",
+    instructions=_SEAT_INSTRUCTIONS,
+    tools=[update_seat],
+)
+
+triage_agent = RealtimeAgent(
+    name="Companion",
+    handoff_description="A triage agent that can delegate a customer's request to the appropriate agent.",
+    instructions=_luna_instructions,
     handoffs=[faq_agent, realtime_handoff(seat_booking_agent)],
 )
 
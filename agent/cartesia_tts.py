@@ -8,11 +8,18 @@ for generating audio from text responses.
 import os
 import asyncio
 import logging
+import threading
+import time
 from typing import Optional, AsyncGenerator, Any
+
+import httpx
 from cartesia import Cartesia
 
 logger = logging.getLogger(__name__)
 
+# Chunks the reader thread may hold ahead of the consumer before it waits.
+_STREAM_READ_AHEAD = 4
+
 
 class CartesiaTTS:
     """
@@ -38,9 +45,10 @@ class CartesiaTTS:
             api_key: Cartesia API key (defaults to CARTESIA_API_KEY env var)
             model_id: Cartesia model ID to use (default: sonic-3)
             voice_id: Voice ID to use for generation
-            sample_rate: Audio sample rate (default: 44100)
-            encoding: Audio encoding format (default: pcm_f32le)
-            container: Audio container format (default: wav)
+            sample_rate: Audio sample rate (default: 24000)
+            encoding: Audio encoding format (default: pcm_s16le, relayed to
+                the browser as-is so no per-chunk conversion is needed)
+            container: Audio container format (default: raw)
         """
         self.api_key = api_key or os.getenv("CARTESIA_API_KEY")
         if not self.api_key:
@@ -55,10 +63,20 @@ class CartesiaTTS:
         self.encoding = encoding
         self.container = container
         
-        # Initialize Cartesia client
-        self.client = Cartesia(api_key=self.api_key)
+        # One pooled HTTP client for every request. httpx's default keep-alive expiry (5 s) is
+        # shorter than a typical pause between turns, which would mean a fresh TLS handshake per reply.
+        self._http = httpx.Client(
+            timeout=60.0,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=300.0),
+        )
+        self.client = Cartesia(api_key=self.api_key, httpx_client=self._http)
         logger.info(f"Cartesia TTS initialized with model: {model_id}, voice: {voice_id}")
     
+    def close(self) -> None:
+        """Close pooled connections to Cartesia."""
+        self._http.close()
+
     def get_audio(self, transcript: str) -> bytes:
         """
         Convert text transcript to audio bytes.
@@ -73,7 +91,8 @@ class CartesiaTTS:
             Exception: If TTS generation fails
         """
         try:
-            logger.debug(f"Generating audio for transcript: {transcript[:50]}...")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Generating audio for transcript: %s...", transcript[:50])
             
             chunk_iter = self.client.tts.bytes(
                 model_id=self.model_id,
@@ -95,11 +114,11 @@ class CartesiaTTS:
                 audio_buffer.extend(chunk)
             audio_data = bytes(audio_buffer)
             
-            logger.debug(f"Generated {len(audio_data)} bytes of audio")
+            logger.debug("Generated %d bytes of audio", len(audio_data))
             return audio_data
             
         except Exception as e:
-            logger.error(f"Error generating audio with Cartesia: {e}")
+            logger.error("Error generating audio with Cartesia: %s", e)
             raise
     
     async def get_audio_async(self, transcript: str) -> bytes:
@@ -112,8 +131,7 @@ class CartesiaTTS:
         Returns:
             Audio data as bytes in the specified format
         """
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self.get_audio, transcript)
+        return await asyncio.to_thread(self.get_audio, transcript)
     
     async def get_audio_stream(self, transcript: str) -> AsyncGenerator[bytes, None]:
         """
@@ -125,12 +143,25 @@ class CartesiaTTS:
         Yields:
             Audio chunks as they are generated
         """
-        logger.debug(f"Streaming audio for transcript: {transcript[:50]}...")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Streaming audio for transcript: %s...", transcript[:50])
+        start_ns = time.monotonic_ns()
         loop = asyncio.get_running_loop()
-        queue: asyncio.Queue[tuple[str, Any]] = asyncio.Queue()
+        # Chunks go in as-is; an exception or the None sentinel ends the stream.
+        queue: asyncio.Queue[Any] = asyncio.Queue()
+        # Free read-ahead slots: the thread takes one per chunk and the consumer gives it back on
+        # dequeue, so the queue never holds more than _STREAM_READ_AHEAD chunks.
+        slots = threading.Semaphore(_STREAM_READ_AHEAD)
+        # Set when the consumer goes away (barge-in, disconnect) so the thread stops reading.
+        stop = threading.Event()
 
         def produce_chunks() -> None:
-            """Run the blocking Cartesia iterator in a thread and push chunks back to the loop."""
+            """Run the blocking Cartesia iterator in a thread and push chunks back to the loop.
+
+            The thread reads a few chunks ahead, so network reads overlap the WebSocket sends, and
+            then blocks until the consumer catches up.
+            """
+            chunk_iter = None
             try:
                 chunk_iter = self.client.tts.bytes(
                     model_id=self.model_id,
@@ -146,33 +177,42 @@ class CartesiaTTS:
                     },
                 )
                 for chunk in chunk_iter:
-                    loop.call_soon_threadsafe(queue.put_nowait, ("chunk", chunk))
+                    slots.acquire()
+                    if stop.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, chunk)
             except Exception as exc:
-                loop.call_soon_threadsafe(queue.put_nowait, ("error", exc))
+                loop.call_soon_threadsafe(queue.put_nowait, exc)
             finally:
-                loop.call_soon_threadsafe(queue.put_nowait, ("done", None))
+                close = getattr(chunk_iter, "close", None)
+                if close is not None:
+                    # Leaves the SDK's streaming `with` block, so the HTTP response is released now.
+                    close()
+                loop.call_soon_threadsafe(queue.put_nowait, None)
 
-        producer_task = asyncio.create_task(asyncio.to_thread(produce_chunks))
+        # A bare executor future: the producer needs no task or context copy around it. It never
+        # raises (errors travel through the queue), so nothing has to collect its result.
+        loop.run_in_executor(None, produce_chunks)
         try:
             while True:
-                kind, payload = await queue.get()
-                if kind == "chunk":
-                    yield payload
-                elif kind == "error":
-                    raise payload
-                elif kind == "done":
+                item = await queue.get()
+                if item is None:
                     break
-        except asyncio.CancelledError:
-            producer_task.cancel()
-            raise
+                if isinstance(item, Exception):
+                    raise item
+                slots.release()
+                yield item
+            logger.debug("Streamed audio in %d ms", (time.monotonic_ns() - start_ns) // 1_000_000)
         except Exception as exc:
-            logger.error(f"Error streaming audio with Cartesia: {exc}")
+            logger.error("Error streaming audio with Cartesia: %s", exc)
             raise
         finally:
-            try:
-                await producer_task
-            except asyncio.CancelledError:
-                pass
+            stop.set()
+            # Wake the thread if it is waiting for a slot, so it sees stop and exits. A thread that is
+            # inside a blocking Cartesia read can't be interrupted: it stays alive (with the HTTP
+            # stream open) until that chunk arrives, then closes the stream. It is not awaited, so a
+            # barge-in or disconnect never waits on the network.
+            slots.release()
     
     def update_voice(self, voice_id: str) -> None:
         """
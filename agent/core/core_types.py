@@ -21,25 +21,41 @@ class UserState(Enum):
     ERROR = auto()
 
 
-@dataclass
+# Turn timestamps are time.monotonic_ns() values taken once per dispatched event.
+@dataclass(slots=True)
 class UserTurn:
-    speech_start_time: Optional[float] = None
-    speech_end_time: Optional[float] = None
-    commit_time: Optional[float] = None
+    speech_start_time: Optional[int] = None
+    speech_end_time: Optional[int] = None
+    commit_time: Optional[int] = None
     transcript: Optional[str] = None
     status: str = "idle"
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentTurn:
     agent_name: Optional[str] = None
-    think_start_time: Optional[float] = None
-    speak_start_time: Optional[float] = None
-    speak_end_time: Optional[float] = None
+    think_start_time: Optional[int] = None
+    speak_start_time: Optional[int] = None
+    speak_end_time: Optional[int] = None
     status: str = "idle"
 
 
-@dataclass
+@dataclass(slots=True)
+class SessionMetrics:
+    """Per-session latency marks (monotonic ns) and last-turn token usage."""
+    speech_end_ns: Optional[int] = None
+    tts_ready_ns: Optional[int] = None
+    response_created_ns: Optional[int] = None
+    llm_first_token_ns: Optional[int] = None
+    input_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+    # Best-effort outbound frames dropped because the client's queue was full (backpressure signal).
+    dropped_frames: int = 0
+    # Oldest inbound audio chunks discarded because the model pump fell behind.
+    dropped_audio_in: int = 0
+
+
+@dataclass(slots=True)
 class SessionState:
     session_id: str
     connected: bool = True
@@ -47,8 +63,15 @@ class SessionState:
     history: list = field(default_factory=list)
     current_user_turn: Optional[UserTurn] = None
     current_agent_turn: Optional[AgentTurn] = None
-    audio_task: Optional[Any] = None
     tts_enabled: bool = False
     last_transcript: Optional[str] = None
-    metrics: dict = field(default_factory=dict)
-    metrics_sent_flags: dict = field(default_factory=dict)
\ No newline at end of file
+    # hash() of the transcript TTS last ran for in the current response; reset on response.created.
+    last_tts_transcript_hash: Optional[int] = None
+    # Sanitized history as the client last saw it; lets history_updated go out as appends or not at all.
+    sent_history: list = field(default_factory=list)
+    nick_name: Optional[str] = None
+    # Event types the client asked to receive; None means everything.
+    subscribed_types: Optional[frozenset[str]] = None
+    metrics: SessionMetrics = field(default_factory=SessionMetrics)
+    # Metric values waiting to go out in the next coalesced metrics frame.
+    pending_metrics: dict = field(default_factory=dict)
@@ -1,8 +1,13 @@
+import inspect
+import sys
 import time
 import logging
-from typing import Any, Optional
+import weakref
+from typing import Any, Awaitable, Callable, Optional
 from typing_extensions import assert_never
 
+from pydantic import BaseModel
+
 from agents.realtime.items import RealtimeItem
 from agents.realtime import RealtimeSessionEvent
 
@@ -10,107 +15,237 @@ from .core_types import SessionState, AgentTurn, UserTurn
 
 logger = logging.getLogger(__name__)
 
+_DELTA_EVENTS = frozenset({"response.text.delta", "response.audio.delta"})
+_AUDIO_PART_TYPES = frozenset({"audio", "input_audio"})
+
+# Sanitized history dicts keyed by id(item). The SDK replaces history items (model_copy) instead
+# of mutating them, so a live item maps to the same output across history_updated events.
+_SANITIZED_ITEMS: dict[int, tuple[weakref.ref, dict[str, Any]]] = {}
+
+
+def _forget_sanitized(key: int, ref: weakref.ref) -> None:
+    entry = _SANITIZED_ITEMS.get(key)
+    if entry is not None and entry[0] is ref:
+        del _SANITIZED_ITEMS[key]
+
+
+def _shallow_dump(model: BaseModel) -> dict[str, Any]:
+    """Field dict of a flat pydantic model (declared fields + extras) without a recursive model_dump."""
+    data = dict(model.__dict__)
+    extra = model.__pydantic_extra__
+    if extra:
+        data.update(extra)
+    return data
+
+# Handlers that never await are plain functions; only the ones that call into the manager are coroutines.
+Handler = Callable[..., Optional[dict[str, Any]] | Awaitable[Optional[dict[str, Any]]]]
+
+# event type -> (EventDispatcher handler, is_async), in definition order; filled at import time by @handler.
+_HANDLERS: dict[str, list[tuple[Handler, bool]]] = {}
+
+
+def handler(*event_types: str) -> Callable[[Handler], Handler]:
+    """Register an EventDispatcher method for the given event types."""
+    def wrap(func: Handler) -> Handler:
+        entry = (func, inspect.iscoroutinefunction(func))
+        for event_type in event_types:
+            _HANDLERS.setdefault(event_type, []).append(entry)
+        return func
+    return wrap
+
 
 class EventSerializer:
     """Pure serializer: converts RealtimeSessionEvent → normalized dict."""
 
+    # Streaming delta types (after serialize); the only events servers drop when a client falls behind.
+    DELTA_EVENT_TYPES: frozenset[str] = _DELTA_EVENTS
+
     @staticmethod
     def unwrap_data(x):
-        while True:
-            if x is None:
-                return None
-            if isinstance(x, dict):
+        # SDK payloads nest at most a couple of `.data` wrappers deep; one getattr per level.
+        for _ in range(3):
+            if x is None or isinstance(x, dict):
                 return x
-            if hasattr(x, "data"):
-                x = getattr(x, "data")
-                continue
-            return None
+            x = getattr(x, "data", None)
+        return x if isinstance(x, dict) else None
 
     @staticmethod
     def sanitize_history_item(item: RealtimeItem) -> dict[str, Any]:
-        item_dict = item.model_dump()
+        key = id(item)
+        cached = _SANITIZED_ITEMS.get(key)
+        if cached is not None and cached[0]() is item:
+            return cached[1]
+        # Items and their content parts are flat models, so a shallow read matches model_dump().
+        item_dict = _shallow_dump(item)
         content = item_dict.get("content")
         if isinstance(content, list):
             sanitized_content: list[Any] = []
             for part in content:
-                if isinstance(part, dict):
-                    sanitized_part = part.copy()
-                    if sanitized_part.get("type") in {"audio", "input_audio"}:
-                        sanitized_part.pop("audio", None)
-                    sanitized_content.append(sanitized_part)
-                else:
-                    sanitized_content.append(part)
+                if isinstance(part, BaseModel):
+                    # The shallow dump is already a fresh dict, so trim it in place.
+                    part = _shallow_dump(part)
+                    if part.get("type") in _AUDIO_PART_TYPES:
+                        part.pop("audio", None)
+                elif isinstance(part, dict) and part.get("type") in _AUDIO_PART_TYPES and "audio" in part:
+                    # Only audio parts need a trimmed copy; other dict parts pass through as-is.
+                    part = {k: v for k, v in part.items() if k != "audio"}
+                sanitized_content.append(part)
             item_dict["content"] = sanitized_content
+        ref = weakref.ref(item, lambda ref, key=key: _forget_sanitized(key, ref))
+        _SANITIZED_ITEMS[key] = (ref, item_dict)
         return item_dict
 
     @staticmethod
     def serialize(event: RealtimeSessionEvent) -> dict[str, Any]:
-        base_event: dict[str, Any] = {"type": event.type}
-        # lightweight mapping, keep parity with previous implementation
-        if event.type == "agent_start":
-            base_event["agent"] = event.agent.name
-        elif event.type == "agent_end":
-            base_event["agent"] = event.agent.name
-        elif event.type == "handoff":
-            base_event["from"] = event.from_agent.name
-            base_event["to"] = event.to_agent.name
-        elif event.type == "tool_start":
-            base_event["tool"] = event.tool.name
-        elif event.type == "tool_end":
-            base_event["tool"] = event.tool.name
-            base_event["output"] = str(event.output)
-        elif event.type == "audio":
-            import base64
-
-            base_event["audio"] = base64.b64encode(event.audio.data).decode("utf-8")
-        elif event.type == "history_updated":
-            base_event["history"] = [EventSerializer.sanitize_history_item(item) for item in event.history]
-        elif event.type == "history_added":
-            try:
-                base_event["item"] = EventSerializer.sanitize_history_item(event.item)
-            except Exception:
-                base_event["item"] = None
-        elif event.type == "guardrail_tripped":
-            base_event["guardrail_results"] = [{"name": result.guardrail.name} for result in event.guardrail_results]
-        elif event.type == "raw_model_event":
-            raw = event.data
-            base_event["raw_model_event"] = {"type": raw.type}
-            if getattr(raw, "type", None) == "raw_server_event":
-                payload = EventSerializer.unwrap_data(getattr(raw, "data", None))
-                if payload and payload.get("type") == "response.output_text.done":
-                    base_event["type"] = "response.output_text.done"
-                    base_event["transcript"] = payload.get("text", "")
-                else:
-                    base_event["type"] = payload.get("type")
-                    if "response" in payload:
-                        base_event["response"] = payload["response"]
-                        
-            data = getattr(raw, "data", None) or getattr(raw, "message", None) or raw
-            if isinstance(data, dict):
-                if "transcript" in data:
-                    base_event["raw_model_event"]["transcript"] = data["transcript"]
-                item = data.get("item") or data.get("conversation_item")
-                if isinstance(item, dict):
-                    content = item.get("content")
-                    if isinstance(content, list):
-                        for part in content:
-                            if isinstance(part, dict) and "transcript" in part:
-                                base_event["raw_model_event"]["transcript"] = part["transcript"]
-                                break
-        elif event.type == "error":
-            base_event["error"] = str(event.error) if hasattr(event, "error") else "Unknown error"
+        event_type = event.type
+        base_event: dict[str, Any] = {"type": event_type}
+        serializer = _SERIALIZERS.get(event_type)
+        if serializer is not None:
+            serializer(event, base_event)
         return base_event
 
+    @staticmethod
+    def peek_type(event: RealtimeSessionEvent) -> Optional[str]:
+        """The "type" serialize() would produce, read without building the payload."""
+        event_type = event.type
+        if event_type != "raw_model_event":
+            return event_type
+        raw = event.data
+        if raw.type != "raw_server_event":
+            return event_type
+        payload = EventSerializer.unwrap_data(getattr(raw, "data", None))
+        return payload.get("type") if payload else None
+
+
+# Per-type serializers: each adds its fields to base_event in place (keeps parity with the old if/elif chain).
+def _serialize_agent(event: Any, base_event: dict[str, Any]) -> None:
+    base_event["agent"] = event.agent.name
+
+
+def _serialize_handoff(event: Any, base_event: dict[str, Any]) -> None:
+    base_event["from"] = event.from_agent.name
+    base_event["to"] = event.to_agent.name
+
+
+def _serialize_tool_start(event: Any, base_event: dict[str, Any]) -> None:
+    base_event["tool"] = event.tool.name
+
+
+def _serialize_tool_end(event: Any, base_event: dict[str, Any]) -> None:
+    base_event["tool"] = event.tool.name
+    base_event["output"] = str(event.output)
+
+
+def _serialize_audio(event: Any, base_event: dict[str, Any]) -> None:
+    # Raw PCM view; the manager ships it in a binary frame rather than base64 JSON.
+    base_event["audio"] = memoryview(event.audio.data)
+    base_event["item_id"] = event.item_id
+    base_event["content_index"] = event.content_index
+
+
+def _serialize_history_updated(event: Any, base_event: dict[str, Any]) -> None:
+    sanitize = EventSerializer.sanitize_history_item
+    base_event["history"] = [sanitize(item) for item in event.history]
+
+
+def _serialize_history_added(event: Any, base_event: dict[str, Any]) -> None:
+    try:
+        base_event["item"] = EventSerializer.sanitize_history_item(event.item)
+    except Exception:
+        base_event["item"] = None
+
+
+def _serialize_guardrail_tripped(event: Any, base_event: dict[str, Any]) -> None:
+    base_event["guardrail_results"] = [{"name": result.guardrail.name} for result in event.guardrail_results]
+
+
+def _serialize_raw_model_event(event: Any, base_event: dict[str, Any]) -> None:
+    raw = event.data
+    raw_type = raw.type
+    raw_data = getattr(raw, "data", None)
+    raw_event: dict[str, Any] = {"type": raw_type}
+    base_event["raw_model_event"] = raw_event
+    if raw_type == "raw_server_event":
+        payload = EventSerializer.unwrap_data(raw_data)
+        if payload and payload.get("type") == "response.output_text.done":
+            base_event["type"] = "response.output_text.done"
+            base_event["transcript"] = payload.get("text", "")
+        elif payload:
+            # Server event types arrive as fresh JSON strings; interning makes later
+            # comparisons and table lookups pointer-fast.
+            payload_type = payload.get("type")
+            base_event["type"] = sys.intern(payload_type) if isinstance(payload_type, str) else payload_type
+            if "response" in payload:
+                base_event["response"] = payload["response"]
+
+    data = raw_data or getattr(raw, "message", None) or raw
+    if isinstance(data, dict):
+        if "transcript" in data:
+            raw_event["transcript"] = data["transcript"]
+        item = data.get("item") or data.get("conversation_item")
+        if isinstance(item, dict):
+            content = item.get("content")
+            if isinstance(content, list):
+                for part in content:
+                    if isinstance(part, dict) and "transcript" in part:
+                        raw_event["transcript"] = part["transcript"]
+                        break
+
+
+def _serialize_error(event: Any, base_event: dict[str, Any]) -> None:
+    base_event["error"] = str(event.error) if hasattr(event, "error") else "Unknown error"
+
+
+_SERIALIZERS: dict[str, Callable[[Any, dict[str, Any]], None]] = {
+    "agent_start": _serialize_agent,
+    "agent_end": _serialize_agent,
+    "handoff": _serialize_handoff,
+    "tool_start": _serialize_tool_start,
+    "tool_end": _serialize_tool_end,
+    "audio": _serialize_audio,
+    "history_updated": _serialize_history_updated,
+    "history_added": _serialize_history_added,
+    "guardrail_tripped": _serialize_guardrail_tripped,
+    "raw_model_event": _serialize_raw_model_event,
+    "error": _serialize_error,
+}
+
 
 class EventDispatcher:
     """Stateful dispatcher that handles lifecycle hooks and event routing."""
 
+    # Optional *_hook callables are slots too: unset, they read as absent to the hasattr checks.
+    __slots__ = ("manager", "on_enter_hook", "on_exit_hook", "on_user_turn_completed_hook")
+
     def __init__(self, manager: Any):
         self.manager = manager
 
+    @staticmethod
+    def handles(event_type: str) -> bool:
+        """True if any handler updates session state for this event type."""
+        return event_type in _HANDLERS
+
+    @staticmethod
+    def needs_dispatch(event: dict[str, Any]) -> bool:
+        """False when dispatch() would do nothing: no handler for the type and no transcript aboard."""
+        if event.get("type") in _HANDLERS or "transcript" in event:
+            return True
+        raw = event.get("raw_model_event")
+        return isinstance(raw, dict) and "transcript" in raw
+
+    @staticmethod
+    def delta_is_noop(state: SessionState) -> bool:
+        """True once another text/audio delta cannot change turn state or first-token metrics."""
+        turn = state.current_agent_turn
+        return turn is not None and turn.status == "speaking" and state.metrics.llm_first_token_ns is not None
+
     @staticmethod
     def standardize_event_payload(event: dict, participant_id: str = None, state: str = None, data: dict = None) -> dict:
-        payload = {"type": event.get("type"), "timestamp": event.get("timestamp", time.time())}
+        # Wall-clock timestamp for clients; only read the clock when the caller did not stamp the event.
+        timestamp = event.get("timestamp")
+        if timestamp is None:
+            timestamp = time.time()
+        payload = {"type": event.get("type"), "timestamp": timestamp}
         if participant_id:
             payload["participant_id"] = participant_id
         if state:
@@ -124,12 +259,12 @@ class EventDispatcher:
 
     # Lifecycle hooks
     async def on_enter(self, session_id: str):
-        logger.info(f"[Lifecycle] on_enter: Agent entered session {session_id}")
+        logger.info("[Lifecycle] on_enter: Agent entered session %s", session_id)
         if hasattr(self, "on_enter_hook") and callable(self.on_enter_hook):
             await self.on_enter_hook(session_id)
 
     async def on_exit(self, session_id: str):
-        logger.info(f"[Lifecycle] on_exit: Agent exiting session {session_id}")
+        logger.info("[Lifecycle] on_exit: Agent exiting session %s", session_id)
         if hasattr(self, "on_exit_hook") and callable(self.on_exit_hook):
             await self.on_exit_hook(session_id)
         state = self.manager.session_states.get(session_id)
@@ -138,137 +273,146 @@ class EventDispatcher:
             state.current_user_turn = None
 
     async def on_user_turn_completed(self, session_id: str):
-        logger.info(f"[Lifecycle] on_user_turn_completed: User turn completed in session {session_id}")
+        logger.info("[Lifecycle] on_user_turn_completed: User turn completed in session %s", session_id)
         if hasattr(self, "on_user_turn_completed_hook") and callable(self.on_user_turn_completed_hook):
             await self.on_user_turn_completed_hook(session_id)
 
-    async def dispatch(self, session_id: str, serialized_event: dict[str, Any]) -> list[dict[str, Any]]:
+    async def dispatch(self, session_id: str, serialized_event: dict[str, Any], now_ns: Optional[int] = None) -> None:
+        """Update session state for the event; handler extras (metrics, interrupted) are merged into it in place."""
         state = self.manager.session_states.get(session_id)
         if not state:
-            return []
-        outgoing: list[dict[str, Any]] = []
+            return
         event_type = serialized_event.get("type")
-        current_time = time.time()
-        await self._handle_room_event(state, serialized_event, current_time)
-        await self._handle_agent_event(state, serialized_event, current_time)
-        await self._handle_user_event(state, serialized_event, current_time)
-        # Extract transcripts from events (STT/LLM) and store on state and current user turn
-        await self._handle_transcript_event(state, serialized_event, current_time)
-        await self._handle_conversation_event(state, serialized_event, current_time, session_id)
-        await self._handle_history_event(state, serialized_event)
-        await self._handle_audio_event(state, serialized_event, current_time)
-        interruption_msg = await self._handle_interruption(state, serialized_event, session_id)
-        if interruption_msg:
-            outgoing.append(interruption_msg)
-        metrics_msg = await self._handle_metrics_event(state, serialized_event, current_time)
-        if metrics_msg:
-            outgoing.append(metrics_msg)
-        return outgoing
-
-    async def _handle_room_event(self, state: SessionState, event: dict, current_time: float):
-        pass
-
-    async def _handle_agent_event(self, state: SessionState, event: dict, current_time: float):
-        event_type = event.get("type")
+        # Monotonic nanoseconds; converted to ms only when a metric is emitted.
+        current_time = now_ns if now_ns is not None else time.monotonic_ns()
+        # Transcripts can ride on any event type (STT/LLM), so this one is not table-driven.
+        self._handle_transcript_event(state, serialized_event, current_time)
+        for func, is_async in _HANDLERS.get(event_type, ()):
+            msg = func(self, state, serialized_event, event_type, current_time, session_id)
+            if is_async:
+                msg = await msg
+            if msg:
+                # Piggyback on the event's own frame instead of sending a second one.
+                serialized_event.update(msg)
+
+    @handler("agent_start", "agent_end", "handoff")
+    def _handle_agent_event(self, state: SessionState, event: dict, event_type: str, current_time: int, session_id: str):
+        turn = state.current_agent_turn
         if event_type == "agent_start":
             agent_name = event.get("agent")
             state.current_agent_turn = AgentTurn(agent_name=agent_name, think_start_time=current_time)
-            logger.info(f"Agent started: {agent_name}")
+            logger.info("Agent started: %s", agent_name)
         elif event_type == "agent_end":
-            if state.current_agent_turn:
-                state.current_agent_turn.status = "done"
-                state.current_agent_turn.speak_end_time = current_time
-            logger.info(f"Agent ended: {event.get('agent')}")
+            if turn:
+                turn.status = "done"
+                turn.speak_end_time = current_time
+            logger.info("Agent ended: %s", event.get("agent"))
         elif event_type == "handoff":
-            if state.current_agent_turn:
-                state.current_agent_turn.status = "done"
-            state.current_agent_turn = AgentTurn(agent_name=event.get("to"), think_start_time=current_time)
-            logger.info(f"Handoff from {event.get('from')} to {event.get('to')}")
+            if turn:
+                turn.status = "done"
+            to_agent = event.get("to")
+            state.current_agent_turn = AgentTurn(agent_name=to_agent, think_start_time=current_time)
+            logger.info("Handoff from %s to %s", event.get("from"), to_agent)
 
-    async def _handle_user_event(self, state: SessionState, event: dict, current_time: float):
-        event_type = event.get("type")
+    @handler(
+        "input_audio_buffer.speech_started",
+        "input_audio_buffer.speech_stopped",
+        "input_audio_buffer.committed",
+    )
+    def _handle_user_event(self, state: SessionState, event: dict, event_type: str, current_time: int, session_id: str):
+        turn = state.current_user_turn
         if event_type == "input_audio_buffer.speech_started":
-            if not state.current_user_turn:
-                state.current_user_turn = UserTurn()
-            state.current_user_turn.speech_start_time = current_time
-            state.current_user_turn.status = "listening"
-            logger.debug(f"User speech started")
+            if not turn:
+                turn = state.current_user_turn = UserTurn()
+            turn.speech_start_time = current_time
+            turn.status = "listening"
+            logger.debug("User speech started")
         elif event_type == "input_audio_buffer.speech_stopped":
-            if state.current_user_turn:
-                state.current_user_turn.speech_end_time = current_time
+            if turn:
+                turn.speech_end_time = current_time
                 # record speech end into metrics for latency calculations
-                try:
-                    state.metrics["speech_end_time"] = current_time
-                except Exception:
-                    pass
-                state.current_user_turn.status = "stopped"
-            logger.debug(f"User speech stopped")
+                state.metrics.speech_end_ns = current_time
+                turn.status = "stopped"
+            logger.debug("User speech stopped")
         elif event_type == "input_audio_buffer.committed":
-            if state.current_user_turn:
-                state.current_user_turn.commit_time = current_time
-                state.current_user_turn.status = "committed"
-            logger.debug(f"User audio committed")
-
-    async def _handle_conversation_event(self, state: SessionState, event: dict, current_time: float, session_id: str):
-        event_type = event.get("type")
-        logger.debug(f"[_handle_conversation_event] event_type={event_type}")
+            if turn:
+                turn.commit_time = current_time
+                turn.status = "committed"
+            logger.debug("User audio committed")
+
+    @handler(
+        "response.created",
+        "response.text.delta",
+        "response.audio.delta",
+        "response.output_text.done",
+    )
+    def _handle_conversation_event(self, state: SessionState, event: dict, event_type: str, current_time: int, session_id: str):
+        logger.debug("[_handle_conversation_event] event_type=%s", event_type)
+        turn = state.current_agent_turn
         if event_type == "response.created":
             # Ensure we have an AgentTurn to record think_start_time
-            if not state.current_agent_turn:
-                state.current_agent_turn = AgentTurn(think_start_time=current_time)
+            if not turn:
+                turn = state.current_agent_turn = AgentTurn(think_start_time=current_time)
             else:
-                state.current_agent_turn.think_start_time = current_time
-            state.current_agent_turn.status = "thinking"
-        elif event_type in ("response.text.delta", "response.audio.delta"):
+                turn.think_start_time = current_time
+            turn.status = "thinking"
+            state.metrics.response_created_ns = current_time
+            state.last_tts_transcript_hash = None
+        elif event_type in _DELTA_EVENTS:
             # If no agent turn exists, create one so we can record speak_start_time
-            if not state.current_agent_turn:
-                state.current_agent_turn = AgentTurn(speak_start_time=current_time)
-                state.current_agent_turn.status = "speaking"
-            elif state.current_agent_turn.status == "thinking":
-                state.current_agent_turn.speak_start_time = current_time
-                state.current_agent_turn.status = "speaking"
+            if not turn:
+                turn = state.current_agent_turn = AgentTurn(speak_start_time=current_time)
+                turn.status = "speaking"
+            elif turn.status == "thinking":
+                turn.speak_start_time = current_time
+                turn.status = "speaking"
         elif event_type == "response.output_text.done":
             transcript = event.get("transcript")
             if transcript:
                 state.last_transcript = transcript
-        elif event_type == "response.done":
-            if state.current_agent_turn:
-                state.current_agent_turn.speak_end_time = current_time
-                state.current_agent_turn.status = "done"
-            # Attempt to extract usage; if missing, set zeros so metrics still report
-            resp = event.get("response") or {}
-            usage = resp.get("usage") if isinstance(resp, dict) else None
-            if usage and isinstance(usage, dict):
-                input_tokens = usage.get("input_tokens", 0) or 0
-                output_tokens = usage.get("output_tokens", 0) or 0
-            else:
-                input_tokens = 0
-                output_tokens = 0
-                logger.warning("⚠️  response.done không có usage field; defaulting tokens to 0")
-            cost = (input_tokens * 0.000004) + (output_tokens * 0.000016)
-            state.total_cost += cost
-            state.metrics["input_tokens"] = input_tokens
-            state.metrics["output_tokens"] = output_tokens
-            logger.info(f"✅ Usage: In={input_tokens}, Out={output_tokens}, Cost=${cost:.6f}, Total=${state.total_cost:.4f}")
-            
-            if hasattr(self.manager, "on_dispatcher_response_done"):
-                await self.manager.on_dispatcher_response_done(session_id, event)
-
-    async def _handle_history_event(self, state: SessionState, event: dict):
-        event_type = event.get("type")
+
+    @handler("response.done")
+    async def _handle_response_done(self, state: SessionState, event: dict, event_type: str, current_time: int, session_id: str):
+        turn = state.current_agent_turn
+        if turn:
+            turn.speak_end_time = current_time
+            turn.status = "done"
+        # Attempt to extract usage; if missing, set zeros so metrics still report
+        resp = event.get("response") or {}
+        usage = resp.get("usage") if isinstance(resp, dict) else None
+        if usage and isinstance(usage, dict):
+            input_tokens = usage.get("input_tokens", 0) or 0
+            output_tokens = usage.get("output_tokens", 0) or 0
+        else:
+            input_tokens = 0
+            output_tokens = 0
+            logger.warning("⚠️  response.done không có usage field; defaulting tokens to 0")
+        cost = (input_tokens * 0.000004) + (output_tokens * 0.000016)
+        state.total_cost += cost
+        metrics = state.metrics
+        metrics.input_tokens = input_tokens
+        metrics.output_tokens = output_tokens
+        logger.info("✅ Usage: In=%s, Out=%s, Cost=$%.6f, Total=$%.4f", input_tokens, output_tokens, cost, state.total_cost)
+        
+        if hasattr(self.manager, "on_dispatcher_response_done"):
+            await self.manager.on_dispatcher_response_done(session_id, event)
+
+    @handler("history_added", "history_updated")
+    def _handle_history_event(self, state: SessionState, event: dict, event_type: str, current_time: int, session_id: str):
         if event_type == "history_added":
-            if "item" in event and event["item"]:
-                state.history.append(event["item"])
+            item = event.get("item")
+            if item:
+                state.history.append(item)
         elif event_type == "history_updated":
             if "history" in event:
                 state.history = event["history"]
 
-    async def _handle_audio_event(self, state: SessionState, event: dict, current_time: float):
-        event_type = event.get("type")
-        if event_type == "response.output_text.done" and state.last_transcript:
-            state.metrics["tts_ready_time"] = current_time
+    @handler("response.output_text.done")
+    def _handle_audio_event(self, state: SessionState, event: dict, event_type: str, current_time: int, session_id: str):
+        if state.last_transcript:
+            state.metrics.tts_ready_ns = current_time
 
-    async def _handle_transcript_event(self, state: SessionState, event: dict, current_time: float):
+    def _handle_transcript_event(self, state: SessionState, event: dict, current_time: int):
         """Handle transcripts coming from model or STT and attach to user turn/state."""
         # Top-level transcript (e.g., response.output_text.done)
         transcript = None
@@ -283,44 +427,51 @@ class EventDispatcher:
             # store as last transcript for session
             state.last_transcript = transcript
             # attach to current user turn if present
-            if state.current_user_turn:
+            turn = state.current_user_turn
+            if turn:
                 try:
-                    state.current_user_turn.transcript = transcript
+                    turn.transcript = transcript
                 except Exception:
                     pass
 
-    async def _handle_interruption(self, state: SessionState, event: dict, session_id: str) -> Optional[dict[str, Any]]:
-        event_type = event.get("type")
-        if event_type == "input_audio_buffer.speech_started":
-            logger.info(f"Interruption detected for session {session_id}")
-            if state.current_agent_turn:
-                state.current_agent_turn.status = "interrupted"
-            if session_id in self.manager.audio_tasks:
-                self.manager.audio_tasks[session_id].cancel()
-                logger.info(f"Cancelled audio task for session {session_id}")
-            return {"type": "audio_interrupted"}
-        return None
+    @handler("input_audio_buffer.speech_started")
+    async def _handle_interruption(self, state: SessionState, event: dict, event_type: str, current_time: int, session_id: str) -> Optional[dict[str, Any]]:
+        logger.info("Interruption detected for session %s", session_id)
+        turn = state.current_agent_turn
+        if turn:
+            turn.status = "interrupted"
+        await self.manager.cancel_tts(session_id)
+        return {"interrupted": True}
 
-    async def _handle_metrics_event(self, state: SessionState, event: dict, current_time: float) -> Optional[dict[str, Any]]:
-        event_type = event.get("type")
+    @handler(
+        "input_audio_buffer.committed",
+        "response.text.delta",
+        "response.audio.delta",
+        "response.done",
+    )
+    def _handle_metrics_event(self, state: SessionState, event: dict, event_type: str, current_time: int, session_id: str) -> Optional[dict[str, Any]]:
+        """Accumulate turn metrics on the state; attach them to the response.done frame."""
         metrics = state.metrics
-        metrics_to_send = {}
+        pending = state.pending_metrics
         if event_type == "input_audio_buffer.committed":
-            if state.current_user_turn and state.current_user_turn.speech_start_time:
-                stt_latency = (current_time - state.current_user_turn.speech_start_time) * 1000
-                metrics_to_send["stt"] = round(stt_latency, 2)
-        elif event_type in ("response.text.delta", "response.audio.delta"):
-            if "llm_first_token_time" not in metrics and state.current_agent_turn and state.current_agent_turn.think_start_time:
-                metrics["llm_first_token_time"] = current_time
-                llm_latency = (current_time - state.current_agent_turn.think_start_time) * 1000
-                metrics_to_send["llm"] = round(llm_latency, 2)
+            user_turn = state.current_user_turn
+            if user_turn and user_turn.speech_start_time:
+                pending["stt"] = (current_time - user_turn.speech_start_time) // 1_000_000
+        elif event_type in _DELTA_EVENTS:
+            agent_turn = state.current_agent_turn
+            if metrics.llm_first_token_ns is None and agent_turn and agent_turn.think_start_time:
+                metrics.llm_first_token_ns = current_time
+                pending["llm"] = (current_time - agent_turn.think_start_time) // 1_000_000
         elif event_type == "response.done":
             if state.total_cost > 0:
-                metrics_to_send["cost"] = round(state.total_cost, 4)
-            if "input_tokens" in metrics:
-                metrics_to_send["input_tokens"] = metrics["input_tokens"]
-            if "output_tokens" in metrics:
-                metrics_to_send["output_tokens"] = metrics["output_tokens"]
-        if metrics_to_send:
-            return {"type": "metrics", "data": metrics_to_send}
+                pending["cost"] = round(state.total_cost, 4)
+            if metrics.input_tokens is not None:
+                pending["input_tokens"] = metrics.input_tokens
+            if metrics.output_tokens is not None:
+                pending["output_tokens"] = metrics.output_tokens
+            if metrics.dropped_frames:
+                pending["dropped_frames"] = metrics.dropped_frames
+            if pending:
+                state.pending_metrics = {}
+                return {"metrics": pending}
         return None
@@ -13,14 +13,13 @@ class PipelineNode:
         self.name = name
 
     async def run(self, *args, **kwargs):
-        start = _time.time()
+        start_ns = _time.monotonic_ns()
         try:
             result = await self.process(*args, **kwargs)
-            elapsed = (_time.time() - start) * 1000
-            logger.info(f"[PipelineNode] {self.name} completed in {elapsed:.2f} ms")
+            logger.debug("[PipelineNode] %s completed in %d ms", self.name, (_time.monotonic_ns() - start_ns) // 1_000_000)
             return result
         except Exception as e:
-            logger.error(f"[PipelineNode] {self.name} error: {e}")
+            logger.error("[PipelineNode] %s error: %s", self.name, e)
             # Emit pipeline error event if dispatcher is available
             dispatcher = kwargs.get("dispatcher")
             session_id = kwargs.get("session_id")
@@ -1,6 +1,6 @@
 import logging
-import time as _time
-from typing import Optional, AsyncGenerator
+from collections import OrderedDict
+from typing import Optional, AsyncGenerator, AsyncIterator
 
 from ..cartesia_tts import CartesiaTTS
 
@@ -10,16 +10,42 @@ logger = logging.getLogger(__name__)
 class TTSService:
     """Decoupled TTS service: handles audio generation and streaming."""
 
-    def __init__(self, cartesia_tts: Optional[CartesiaTTS] = None):
+    __slots__ = ("cartesia_tts", "_cache", "_cache_size", "_cache_max_chars")
+
+    def __init__(self, cartesia_tts: Optional[CartesiaTTS] = None, cache_size: int = 64, cache_max_chars: int = 64):
         self.cartesia_tts = cartesia_tts
-        
-    async def stream_audio(self, transcript: str) -> AsyncGenerator[bytes, None]:
-        start = _time.time()
-        try:
-            async for chunk in self.cartesia_tts.get_audio_stream(transcript):
-                yield chunk
-            elapsed = (_time.time() - start) * 1000
-            logger.info(f"[TTSService] stream_audio completed in {elapsed:.2f} ms")
-        except Exception as e:
-            logger.error(f"[TTSService] Error streaming audio: {e}")
-            raise
+        # LRU of short, frequently repeated phrases ("Hello!", "Yes, I can help") -> full PCM audio.
+        self._cache: OrderedDict[tuple[str, str, str], bytes] = OrderedDict()
+        self._cache_size = cache_size
+        self._cache_max_chars = cache_max_chars
+
+    def _cache_key(self, transcript: str) -> Optional[tuple[str, str, str]]:
+        tts = self.cartesia_tts
+        if tts is None or self._cache_size <= 0 or len(transcript) > self._cache_max_chars:
+            return None
+        # Only whitespace is normalized: case and punctuation change how a phrase is spoken ("US" vs "us").
+        return (tts.model_id, tts.voice_id, " ".join(transcript.split()))
+
+    def stream_audio(self, transcript: str) -> AsyncIterator[bytes]:
+        if self.cartesia_tts is None:
+            raise RuntimeError("Cartesia TTS is not configured")
+        key = self._cache_key(transcript)
+        if key is None:
+            # Nothing to cache: hand back the Cartesia stream itself rather than re-yielding every chunk.
+            return self.cartesia_tts.get_audio_stream(transcript)
+        return self._stream_cached(transcript, key)
+
+    async def _stream_cached(self, transcript: str, key: tuple[str, str, str]) -> AsyncGenerator[bytes, None]:
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            yield cached
+            return
+        collected: list[bytes] = []
+        async for chunk in self.cartesia_tts.get_audio_stream(transcript):
+            collected.append(chunk)
+            yield chunk
+        # Only complete streams are cached; a cancelled stream never reaches this point.
+        self._cache[key] = b"".join(collected)
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
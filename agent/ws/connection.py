@@ -1,6 +1,6 @@
 import asyncio
 from dataclasses import dataclass, field
-from typing import Any, Optional, Literal
+from typing import Any, Callable, Optional, Literal
 
 from fastapi import WebSocket
 
@@ -12,9 +12,12 @@ from ..core.core_types import SessionState
 @dataclass(slots=True)
 class OutgoingMessage:
     kind: Literal["text", "bytes", "close"]
+    # str for text; bytes, bytearray or memoryview for binary (views are sent without copying).
     data: Any
     code: Optional[int] = None
     reason: str = ""
+    # Called by the writer once `data` has been sent, e.g. to return a pooled buffer.
+    release: Optional[Callable[[Any], None]] = None
 
 
 @dataclass(slots=True)
@@ -23,13 +26,24 @@ class Connection:
     websocket: WebSocket
     state: SessionState
     created_at: float
+    # Outbound lanes drained by the single writer: audio (plus audio_start) goes first, then JSON events.
     outgoing: asyncio.Queue[OutgoingMessage]
-    incoming_audio: asyncio.Queue[bytes]
-    session_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    audio_out: asyncio.Queue[OutgoingMessage]
+    incoming_audio: asyncio.Queue[memoryview]
+    # Single-owner fields: event_task opens and reads `session`, writer_task owns the socket,
+    # audio_pump_task drains `incoming_audio`. Other tasks only read or go through queues.
     session_context: Optional[Any] = None
     session: Optional[RealtimeSession] = None
+    session_ready: Optional[asyncio.Future] = None
     writer_task: Optional[asyncio.Task] = None
     event_task: Optional[asyncio.Task] = None
     audio_pump_task: Optional[asyncio.Task] = None
     tts_task: Optional[asyncio.Task] = None
+    # In-flight interrupt; repeated requests while it runs are folded into it.
+    interrupt_task: Optional[asyncio.Task] = None
     closed: bool = False
+    # Set whenever either outbound lane gets a message; the writer sleeps on it when both are empty.
+    wakeup: asyncio.Event = field(default_factory=asyncio.Event)
+    # Writer-owned scratch buffer for merging back-to-back TTS frames; grows to the largest burst
+    # (bounded by WS_WRITE_COALESCE_BYTES) and is reused, never shrunk.
+    send_buf: bytearray = field(default_factory=bytearray)
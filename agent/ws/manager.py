@@ -1,12 +1,12 @@
 import asyncio
-import json
 import logging
 import os
-import sys
+import struct
 import time
-from array import array
-from typing import Any, Optional
+from typing import Any, Awaitable, Callable, Coroutine, Final, Optional
 
+import numpy as np
+import orjson
 from dotenv import load_dotenv
 from fastapi import WebSocket
 
@@ -23,122 +23,390 @@ from ..core.dispatcher import EventDispatcher, EventSerializer
 from ..core.tts_service import TTSService
 
 try:
-    from ..agent import get_starting_agent
+    from ..agent import clean_nick_name, get_starting_agent
 except ImportError:
-    from agent import get_starting_agent
+    from agent import clean_nick_name, get_starting_agent
 
 load_dotenv()
 logging.basicConfig(level=logging.INFO)
 
 
+def _require_env(name: str) -> str:
+    value = os.getenv(name)
+    if not value:
+        raise RuntimeError(f"{name} environment variable is required (set it or add it to .env).")
+    return value
+
+
+# Credentials are validated once at import so misconfiguration fails at startup, not per connect.
+_AZURE_API_KEY: Final[str] = _require_env("AZURE_OPENAI_API_KEY")
+_AZURE_REALTIME_URL: Final[str] = _require_env("AZURE_OPENAI_REALTIME_URL")
+_CARTESIA_API_KEY: Final[str] = _require_env("CARTESIA_API_KEY")
+
+# Invariant session config, built once at import.
+_RUN_CONFIG = RealtimeRunConfig(async_tool_calls=False)
+_MODEL_CONFIG_TEMPLATE: RealtimeModelConfig = {
+    "initial_model_settings": {
+        "turn_detection": {
+            "type": "server_vad",
+            "prefix_padding_ms": 1000,
+            "silence_duration_ms": 1000,
+            "interrupt_response": True,
+            "create_response": True,
+        },
+        "input_audio_transcription": {
+            "model": "gpt-4o-transcribe",
+            "prompt": "Always transcribe the output into English",
+        },
+        "output_modalities": ["text"],
+    },
+    "api_key": _AZURE_API_KEY,
+    "url": _AZURE_REALTIME_URL,
+}
+
+# Outbound events that may be dropped when the client falls behind.
+_CHATTY_EVENTS = frozenset({
+    "response.text.delta",
+    "response.audio.delta",
+    "history_updated",
+    "history_added",
+})
+
+
+_NO_HEADER = b"\x00\x00\x00\x00"
+# Compiled once: the u32 little-endian header length at the front of every audio frame.
+_HEADER_LEN = struct.Struct("<I")
+
+# Constant / templated JSON envelopes, encoded once at import.
+_AUDIO_START_TEXT = orjson.dumps({"type": "audio_start"}).decode()
+_METRICS_PREFIX = '{"type":"metrics","data":'
+_INTERRUPTED_TEXT = orjson.dumps({"type": "interrupted", "interrupted": True}).decode()
+
+# Raw server events that carry nothing but their type (most deltas) encode to a constant per type.
+_BARE_RAW_EVENT: Final = {"type": "raw_server_event"}
+_BARE_EVENT_TEXT: dict[Optional[str], str] = {}
+
+
+def encode_audio_frame(pcm: bytes | bytearray | memoryview, header: Optional[dict[str, Any]] = None) -> bytearray:
+    """Build a binary audio frame: ``[u32 LE header_len][JSON header][PCM16 bytes]``.
+
+    TTS chunks carry no header (header_len 0). The header is space-padded to an even
+    length so the PCM starts 2-byte aligned and the client can view it as Int16Array.
+    """
+    # Byte view over the caller's buffer: the only copy is the one into the frame below.
+    pcm = memoryview(pcm).cast("B")
+    header_json = orjson.dumps(header) if header else b""
+    if len(header_json) % 2:
+        header_json += b" "
+    offset = 4 + len(header_json)
+    frame = bytearray(offset + pcm.nbytes)
+    _HEADER_LEN.pack_into(frame, 0, len(header_json))
+    frame[4:offset] = header_json
+    frame[offset:] = pcm
+    return frame
+
+
+# SDK event types processed even when unsubscribed: raw events may derive subscribed or
+# stateful types, and errors are always forwarded.
+_UNFILTERED_EVENTS = frozenset({"raw_model_event", "error"})
+
+# Chatty streaming deltas that _process_events may skip outright (before serialize/dispatch) under backpressure.
+_DROPPABLE_DELTAS = EventSerializer.DELTA_EVENT_TYPES
+
+# history_updated that appends or rewrites up to this many items is sent as history_added /
+# history_delta frames instead of a full snapshot.
+_HISTORY_DELTA_MAX = 8
+
+
+def _merge_pcm_frames(frames: list[OutgoingMessage], buf: bytearray) -> Any:
+    """Join header-less PCM frames into ``buf`` and return a view of the filled prefix.
+
+    ``buf`` only ever grows (clearing a bytearray frees its storage), and frames are copied in at a
+    moving write offset. The caller must release the view before the next merge so ``buf`` can grow.
+    """
+    if len(frames) == 1:
+        return frames[0].data
+    # The first frame keeps its empty header; the rest contribute PCM only.
+    total = len(frames[0].data) + sum(len(frame.data) - 4 for frame in frames[1:])
+    if len(buf) < total:
+        buf.extend(bytes(total - len(buf)))
+    view = memoryview(buf)
+    first = frames[0].data
+    offset = len(first)
+    view[:offset] = first
+    for frame in frames[1:]:
+        pcm = memoryview(frame.data)[4:]
+        view[offset:offset + len(pcm)] = pcm
+        offset += len(pcm)
+    return view[:offset]
+
+
+def _drain_into(queue: asyncio.Queue[OutgoingMessage], batch: list[OutgoingMessage]) -> None:
+    while True:
+        try:
+            batch.append(queue.get_nowait())
+        except asyncio.QueueEmpty:
+            return
+
+
+def _eager_task(coro: Coroutine[Any, Any, Any]) -> asyncio.Task:
+    """Create a task that runs synchronously up to its first real suspension (3.12 eager start).
+
+    Used only for per-connection workers, so their first I/O (e.g. the TTS request) is issued
+    in the caller's tick; the loop-wide task factory is left alone for the SDK and Starlette.
+    """
+    return asyncio.Task(coro, loop=asyncio.get_running_loop(), eager_start=True)
+
+
+class _FramePool:
+    """Free list of fixed-size, header-less TTS frames, reused once the writer has sent them."""
+
+    __slots__ = ("frame_bytes", "_free", "_max_free")
+
+    def __init__(self, frame_bytes: int, max_free: int):
+        self.frame_bytes = frame_bytes
+        self._free: list[bytearray] = []
+        self._max_free = max_free
+
+    def acquire(self) -> bytearray:
+        # The 4-byte zero prefix is the empty header; only the PCM part is ever overwritten.
+        return self._free.pop() if self._free else bytearray(self.frame_bytes)
+
+    def release(self, frame: bytearray) -> None:
+        if len(self._free) < self._max_free:
+            self._free.append(frame)
+
+    def release_view(self, view: memoryview) -> None:
+        """Release callback for a partial frame sent as a view of a pooled slab."""
+        frame = view.obj
+        view.release()
+        self.release(frame)
+
+
 class RealtimeWebSocketManager:
     """Owns per-session connections, queues, and model lifecycle."""
     def __init__(self):
         self.connections: dict[str, Connection] = {}
         self.session_states: dict[str, SessionState] = {}
-        # Compatibility: used by dispatcher interruption handler
-        self.audio_tasks: dict[str, asyncio.Task] = {}
+        # Strong refs for fire-and-forget tasks so the loop cannot GC them mid-flight.
+        self._background_tasks: set[asyncio.Task] = set()
+        # Agents are stateless, so one starting agent serves every session.
+        self._starting_agent = get_starting_agent()
         # Event dispatcher
         self.dispatcher = EventDispatcher(self)
         # TTS service (decoupled from manager)
-        self.tts_service = TTSService(cartesia_tts=CartesiaTTS(api_key=os.getenv("CARTESIA_API_KEY")))
+        self.tts_service = TTSService(
+            cartesia_tts=CartesiaTTS(api_key=_CARTESIA_API_KEY),
+            cache_size=int(os.getenv("WS_TTS_CACHE_SIZE", "64")),
+            cache_max_chars=int(os.getenv("WS_TTS_CACHE_MAX_CHARS", "64")),
+        )
         self._outgoing_max = int(os.getenv("WS_OUTGOING_MAX", "512"))
+        # Audio gets its own, deeper lane so a TTS burst never waits behind (or evicts) JSON events.
+        self._outgoing_audio_max = int(os.getenv("WS_OUTGOING_AUDIO_MAX", "1024"))
         self._incoming_audio_max = int(os.getenv("WS_INCOMING_AUDIO_MAX", "32"))
         self._tts_chunk_bytes = int(os.getenv("WS_TTS_CHUNK_BYTES", "4096"))
+        # Shared by all sessions (single loop thread); frames lost to disconnects are just re-allocated.
+        self._frame_pool = _FramePool(4 + self._tts_chunk_bytes, max_free=256)
+        # Upper bound for one merged TTS frame, so a long backlog still reaches the client in pieces.
+        self._write_coalesce_bytes = int(os.getenv("WS_WRITE_COALESCE_BYTES", str(32 * 1024)))
+        # Max JSON events the writer joins into one array text frame; 1 sends every event on its own.
+        self._event_batch_max = max(1, int(os.getenv("WS_EVENT_BATCH", "32")))
+        self._batch_concurrency = int(os.getenv("WS_BATCH_CONCURRENCY", "32"))
+        # Legacy clients send mic audio as JSON int16 arrays; WS_JSON_AUDIO=0 accepts binary frames only.
+        self.json_audio_enabled = os.getenv("WS_JSON_AUDIO", "1") != "0"
         self._logger = logging.getLogger(__name__)
 
     def _get_conn(self, session_id: str) -> Optional[Connection]:
         return self.connections.get(session_id)
 
-    async def _cancel_task(self, task: Optional[asyncio.Task]) -> None:
-        """Best-effort task cancellation to avoid leaking background workers."""
-        if not task:
-            return
-        task.cancel()
-        try:
-            await task
-        except asyncio.CancelledError:
-            return
-        except Exception:
-            return
+    def spawn(self, coro: Awaitable[Any]) -> asyncio.Task:
+        """Run a fire-and-forget coroutine while keeping a reference until it finishes."""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
 
     async def send_json(self, session_id: str, payload: dict[str, Any], *, drop_if_full: bool = False) -> bool:
+        if drop_if_full:
+            conn = self._get_conn(session_id)
+            if conn and not conn.closed and conn.outgoing.full():
+                # It would be dropped anyway; don't pay for serializing it first.
+                conn.state.metrics.dropped_frames += 1
+                return False
+        # Binary frames are reserved for audio (see encode_audio_frame), so JSON goes out as text.
+        return await self.send_text(session_id, orjson.dumps(payload).decode(), drop_if_full=drop_if_full)
+
+    async def send_text(self, session_id: str, text: str, *, drop_if_full: bool = False, audio: bool = False) -> bool:
+        """Enqueue an already-encoded JSON text frame (``audio=True`` keeps it ordered with audio frames)."""
         conn = self._get_conn(session_id)
         if not conn or conn.closed:
             return False
         if conn.writer_task is None:
-            conn.writer_task = asyncio.create_task(self._writer(conn))
+            conn.writer_task = _eager_task(self._writer(conn))
+        queue = conn.audio_out if audio else conn.outgoing
         # Drop best-effort events when the client is slow to avoid blocking the loop.
-        msg = OutgoingMessage(kind="text", data=json.dumps(payload))
+        msg = OutgoingMessage(kind="text", data=text)
         if drop_if_full:
             try:
-                conn.outgoing.put_nowait(msg)
-                return True
+                queue.put_nowait(msg)
             except asyncio.QueueFull:
+                conn.state.metrics.dropped_frames += 1
                 return False
-        await conn.outgoing.put(msg)
+        else:
+            await queue.put(msg)
+        conn.wakeup.set()
         return True
 
-    async def send_bytes(self, session_id: str, data: bytes) -> bool:
+    async def send_texts(self, session_id: str, texts: list[str]) -> bool:
+        """Enqueue several encoded JSON text frames in order, waking the writer once."""
         conn = self._get_conn(session_id)
         if not conn or conn.closed:
             return False
         if conn.writer_task is None:
-            conn.writer_task = asyncio.create_task(self._writer(conn))
-        await conn.outgoing.put(OutgoingMessage(kind="bytes", data=data))
+            conn.writer_task = _eager_task(self._writer(conn))
+        queue = conn.outgoing
+        for text in texts:
+            msg = OutgoingMessage(kind="text", data=text)
+            try:
+                queue.put_nowait(msg)
+            except asyncio.QueueFull:
+                # Let the writer drain what is queued so far before blocking on the rest.
+                conn.wakeup.set()
+                await queue.put(msg)
+        conn.wakeup.set()
+        return True
+
+    async def send_bytes(
+        self,
+        session_id: str,
+        data: bytes | bytearray | memoryview,
+        *,
+        release: Optional[Callable[[Any], None]] = None,
+    ) -> bool:
+        """Enqueue a binary frame; ``release(data)`` runs after it is sent (only if this returns True)."""
+        conn = self._get_conn(session_id)
+        if not conn or conn.closed:
+            return False
+        if conn.writer_task is None:
+            conn.writer_task = _eager_task(self._writer(conn))
+        await conn.audio_out.put(OutgoingMessage(kind="bytes", data=data, release=release))
+        conn.wakeup.set()
         return True
 
     async def _writer(self, conn: Connection) -> None:
         try:
+            outgoing = conn.outgoing
+            audio_out = conn.audio_out
+            wakeup = conn.wakeup
+            send_buf = conn.send_buf
+            coalesce_limit = self._write_coalesce_bytes
+            event_batch_max = self._event_batch_max
             while True:
                 # Single-writer invariant: all WS sends flow through this task.
-                msg = await conn.outgoing.get()
-                if msg.kind == "text":
-                    await conn.websocket.send_text(msg.data)
-                elif msg.kind == "bytes":
-                    await conn.websocket.send_bytes(msg.data)
-                elif msg.kind == "close":
-                    await conn.websocket.close(code=msg.code or 1000, reason=msg.reason or "")
-                    return
+                if audio_out.empty() and outgoing.empty():
+                    wakeup.clear()
+                    await wakeup.wait()
+                    continue
+                # One wake-up drains the whole burst that queued while the last send was in flight,
+                # audio first; events are still drained every pass, so neither lane starves.
+                batch: list[OutgoingMessage] = []
+                _drain_into(audio_out, batch)
+                _drain_into(outgoing, batch)
+                pcm: list[OutgoingMessage] = []
+                pcm_bytes = 0
+                texts: list[str] = []
+                for msg in batch:
+                    if msg.kind == "text":
+                        # Small control events queued together share one JSON array frame.
+                        if pcm:
+                            await self._send_pcm(conn, pcm, send_buf)
+                            pcm_bytes = 0
+                        texts.append(msg.data)
+                        if len(texts) >= event_batch_max:
+                            await self._send_texts(conn, texts)
+                        continue
+                    if texts:
+                        await self._send_texts(conn, texts)
+                    if msg.kind == "bytes" and msg.data[:4] == _NO_HEADER:
+                        # Back-to-back TTS chunks share one frame: header-less PCM concatenates cleanly.
+                        size = len(msg.data)
+                        if pcm and pcm_bytes + size > coalesce_limit:
+                            await self._send_pcm(conn, pcm, send_buf)
+                            pcm_bytes = 0
+                        pcm.append(msg)
+                        pcm_bytes += size
+                        continue
+                    if pcm:
+                        await self._send_pcm(conn, pcm, send_buf)
+                        pcm_bytes = 0
+                    if msg.kind == "bytes":
+                        await conn.websocket.send_bytes(msg.data)
+                        if msg.release is not None:
+                            msg.release(msg.data)
+                    elif msg.kind == "close":
+                        await conn.websocket.close(code=msg.code or 1000, reason=msg.reason or "")
+                        return
+                if texts:
+                    await self._send_texts(conn, texts)
+                if pcm:
+                    await self._send_pcm(conn, pcm, send_buf)
         except asyncio.CancelledError:
             return
         except Exception as e:
             self._logger.info("writer stopped for %s: %s", conn.session_id, e)
         finally:
             if not conn.closed:
-                asyncio.create_task(self.disconnect(conn.session_id))
+                self.spawn(self.disconnect(conn.session_id))
+
+    @staticmethod
+    async def _send_texts(conn: Connection, texts: list[str]) -> None:
+        """Send queued JSON events, several at once as a single ``[...]`` array frame."""
+        if len(texts) == 1:
+            await conn.websocket.send_text(texts[0])
+        else:
+            await conn.websocket.send_text("[" + ",".join(texts) + "]")
+        texts.clear()
+
+    @staticmethod
+    async def _send_pcm(conn: Connection, pcm: list[OutgoingMessage], send_buf: bytearray) -> None:
+        """Send queued TTS frames as one merged frame, then hand pooled buffers back."""
+        data = _merge_pcm_frames(pcm, send_buf)
+        try:
+            # The WS layer frames (copies) the payload before send returns, so the view can go.
+            await conn.websocket.send_bytes(data)
+        finally:
+            if len(pcm) > 1:
+                data.release()
+        for msg in pcm:
+            if msg.release is not None:
+                msg.release(msg.data)
+        pcm.clear()
 
     async def _ensure_session(self, conn: Connection) -> RealtimeSession:
-        """Create or return the realtime session for a connection (lazy init)."""
-        async with conn.session_lock:
-            if conn.session:
-                return conn.session
-            # Lazy-init to keep idle rooms lightweight.
-            agent = get_starting_agent()
-            runner_config = RealtimeRunConfig(async_tool_calls=False)
-            runner = RealtimeRunner(agent, config=runner_config)
-            model_config: RealtimeModelConfig = {
-                "initial_model_settings": {
-                    "turn_detection": {
-                        "type": "server_vad",
-                        "prefix_padding_ms": 1000,
-                        "silence_duration_ms": 1000,
-                        "interrupt_response": True,
-                        "create_response": True,
-                    },
-                    "input_audio_transcription": {
-                        "model": "gpt-4o-transcribe",
-                        "prompt": "Always transcribe the output into English",
-                    },
-                    "output_modalities": ["text"],
-                },
-                "api_key": os.getenv("AZURE_OPENAI_API_KEY"),
-                "url": os.getenv("AZURE_OPENAI_REALTIME_URL"),
-            }
-            conn.session_context = await runner.run(model_config=model_config)
-            conn.session = await conn.session_context.__aenter__()
-            conn.event_task = asyncio.create_task(self._process_events(conn.session_id))
-            return conn.session
+        """Return the realtime session for a connection, starting its event task on first use."""
+        session = conn.session
+        if session is not None:
+            return session
+        if conn.event_task is None:
+            # Lazy-init to keep idle rooms lightweight. The event task is the session's only
+            # writer: it opens the session, publishes it via session_ready, then reads from it.
+            conn.session_ready = asyncio.get_running_loop().create_future()
+            conn.event_task = _eager_task(self._process_events(conn.session_id))
+        # Shielded so a cancelled caller does not cancel setup for everyone else.
+        return await asyncio.shield(conn.session_ready)
+
+    async def _open_session(self, conn: Connection) -> RealtimeSession:
+        """Open the model session; only called from the connection's event task."""
+        # The runner owns its model connection, so it stays per session; agent and config are shared.
+        runner = RealtimeRunner(self._starting_agent, config=_RUN_CONFIG)
+        # Per-session values go through the run context so the agent prompt prefix stays shared.
+        # The session copies model_config before filling in agent settings, so the template is passed as-is.
+        conn.session_context = await runner.run(
+            context={"nick_name": conn.state.nick_name},
+            model_config=_MODEL_CONFIG_TEMPLATE,
+        )
+        conn.session = await conn.session_context.__aenter__()
+        return conn.session
 
     async def connect(self, websocket: WebSocket, session_id: str):
         """Register a WebSocket and initialize per-session state/queues."""
@@ -147,7 +415,9 @@ class RealtimeWebSocketManager:
         if session_id in self.connections:
             await self.disconnect(session_id, code=1012, reason="replaced")
 
-        state = SessionState(session_id=session_id)
+        state = SessionState(
+            session_id=session_id, nick_name=clean_nick_name(websocket.query_params.get("nick"))
+        )
         self.session_states[session_id] = state
 
         conn = Connection(
@@ -156,6 +426,7 @@ class RealtimeWebSocketManager:
             state=state,
             created_at=time.time(),
             outgoing=asyncio.Queue(maxsize=self._outgoing_max),
+            audio_out=asyncio.Queue(maxsize=self._outgoing_audio_max),
             incoming_audio=asyncio.Queue(maxsize=self._incoming_audio_max),
         )
         self.connections[session_id] = conn
@@ -167,32 +438,49 @@ class RealtimeWebSocketManager:
         state = self.session_states.pop(session_id, None)
         if conn:
             conn.closed = True
-            await self._cancel_task(conn.tts_task)
-            await self._cancel_task(conn.audio_pump_task)
-            await self._cancel_task(conn.event_task)
-            await self._cancel_task(conn.writer_task)
+            current = asyncio.current_task()
+            tasks = [
+                task
+                for task in (conn.tts_task, conn.interrupt_task, conn.audio_pump_task, conn.event_task, conn.writer_task)
+                if task is not None and task is not current
+            ]
+            for task in tasks:
+                task.cancel("session_disconnect")
+            if tasks:
+                # Cancel everything first, then wait once, instead of a round trip per worker.
+                await asyncio.gather(*tasks, return_exceptions=True)
+            # The model session and the client socket close independently; errors don't matter at teardown.
+            closers = [conn.websocket.close(code=code, reason=reason)]
             if conn.session_context:
-                try:
-                    await conn.session_context.__aexit__(None, None, None)
-                except Exception:
-                    pass
-            try:
-                await conn.websocket.close(code=code, reason=reason)
-            except Exception:
-                pass
-        self.audio_tasks.pop(session_id, None)
+                closers.append(conn.session_context.__aexit__(None, None, None))
+            await asyncio.gather(*closers, return_exceptions=True)
         if state:
             state.connected = False
-
-    async def send_audio(self, session_id: str, audio_bytes: bytes):
-        """Queue inbound audio for the model pump."""
+            if state.metrics.dropped_frames:
+                self._logger.warning(
+                    "Session %s dropped %d outbound frames to a slow client", session_id, state.metrics.dropped_frames
+                )
+            if state.metrics.dropped_audio_in:
+                self._logger.warning(
+                    "Session %s dropped %d inbound audio chunks behind a slow model",
+                    session_id,
+                    state.metrics.dropped_audio_in,
+                )
+
+    async def send_audio(self, session_id: str, audio_bytes: bytes | bytearray | memoryview):
+        """Queue inbound audio for the model pump; the buffer is forwarded as a view, not copied."""
         conn = self._get_conn(session_id)
         if not conn or conn.closed:
             return
         if conn.audio_pump_task is None:
-            conn.audio_pump_task = asyncio.create_task(self._audio_pump(conn.session_id))
-        # Inbound audio is buffered to apply backpressure to the client.
-        await conn.incoming_audio.put(audio_bytes)
+            conn.audio_pump_task = _eager_task(self._audio_pump(conn.session_id))
+        # Never await here: a stalled model must not hold up the receive loop (and the control
+        # messages behind it). When the pump falls behind, the oldest audio goes first.
+        queue = conn.incoming_audio
+        if queue.full():
+            queue.get_nowait()
+            conn.state.metrics.dropped_audio_in += 1
+        queue.put_nowait(memoryview(audio_bytes))
 
     async def cancel_tts(self, session_id: str) -> None:
         """Stop any in-flight TTS stream for the session."""
@@ -202,21 +490,40 @@ class RealtimeWebSocketManager:
         if conn.tts_task:
             conn.tts_task.cancel()
             conn.tts_task = None
-        self.audio_tasks.pop(session_id, None)
+
+    def set_subscriptions(self, session_id: str, event_types: Optional[list[str]]) -> None:
+        """Limit forwarded model events to the given types (None restores everything); errors always pass."""
+        conn = self._get_conn(session_id)
+        if not conn or conn.closed:
+            return
+        conn.state.subscribed_types = None if event_types is None else frozenset(event_types)
+
+    async def enable_tts(self, session_id: str, on: bool) -> None:
+        """Toggle server-side TTS for a session; turning it off also stops any in-flight stream."""
+        conn = self._get_conn(session_id)
+        if not conn or conn.closed:
+            return
+        conn.state.tts_enabled = on
+        if not on:
+            await self.cancel_tts(session_id)
 
     async def send_client_event(self, session_id: str, event: dict[str, Any]):
-        """Send a raw client event to the underlying realtime model."""
+        """Send a raw client event to the underlying realtime model.
+
+        Callers that already have the payload split out can pass
+        ``{"type": ..., "_other_data": {...}}`` to skip the per-call copy.
+        """
         conn = self._get_conn(session_id)
         if not conn or conn.closed:
             return
+        event_type = event["type"]
+        other_data = event.get("_other_data")
+        if other_data is None:
+            # Control events like input_audio_buffer.commit carry only a type.
+            other_data = {k: v for k, v in event.items() if k != "type"} if len(event) > 1 else {}
         session = await self._ensure_session(conn)
         await session.model.send_event(
-            RealtimeModelSendRawMessage(
-                message={
-                    "type": event["type"],
-                    "other_data": {k: v for k, v in event.items() if k != "type"},
-                }
-            )
+            RealtimeModelSendRawMessage(message={"type": event_type, "other_data": other_data})
         )
 
     async def send_user_message(self, session_id: str, message: RealtimeUserInputMessage):
@@ -234,6 +541,37 @@ class RealtimeWebSocketManager:
             return
         await conn.session.interrupt()
 
+    def request_interrupt(self, session_id: str) -> None:
+        """Fire-and-forget interrupt; VAD retriggers while one is in flight don't start another."""
+        conn = self._get_conn(session_id)
+        if not conn or conn.closed or not conn.session:
+            return
+        task = conn.interrupt_task
+        if task is None or task.done():
+            conn.interrupt_task = self.spawn(self.interrupt(session_id))
+
+    async def _run_batch(self, coros: list[Awaitable[Any]]) -> list[Any]:
+        """Run per-session coroutines concurrently, capped to spare upstream rate limits."""
+        limiter = asyncio.Semaphore(self._batch_concurrency)
+
+        async def run(coro: Awaitable[Any]) -> Any:
+            async with limiter:
+                return await coro
+
+        return await asyncio.gather(*(run(c) for c in coros), return_exceptions=True)
+
+    async def send_user_message_batch(self, items: list[tuple[str, RealtimeUserInputMessage]]) -> list[Any]:
+        """Fan out user messages across sessions; results/exceptions are returned in input order."""
+        return await self._run_batch([self.send_user_message(sid, msg) for sid, msg in items])
+
+    async def interrupt_batch(self, session_ids: list[str]) -> list[Any]:
+        """Interrupt several sessions concurrently."""
+        return await self._run_batch([self.interrupt(sid) for sid in session_ids])
+
+    async def disconnect_batch(self, session_ids: list[str], *, code: int = 1000, reason: str = "") -> list[Any]:
+        """Tear down several sessions concurrently (e.g. on shutdown)."""
+        return await self._run_batch([self.disconnect(sid, code=code, reason=reason) for sid in session_ids])
+
     async def _audio_pump(self, session_id: str) -> None:
         """Drain queued audio into the realtime session."""
         conn = self._get_conn(session_id)
@@ -250,107 +588,241 @@ class RealtimeWebSocketManager:
             self._logger.info("audio_pump stopped for %s: %s", session_id, e)
         finally:
             if not conn.closed:
-                asyncio.create_task(self.disconnect(session_id))
+                self.spawn(self.disconnect(session_id))
 
     async def _process_events(self, session_id: str):
         """Read model events, update state, and enqueue outbound messages."""
         conn = self._get_conn(session_id)
-        if not conn or conn.closed or not conn.session:
+        if not conn or conn.closed:
             return
+        ready = conn.session_ready
         try:
             session = conn.session
-            state = conn.state
+            if session is None:
+                session = await self._open_session(conn)
+            if ready is not None and not ready.done():
+                ready.set_result(session)
 
+            state = conn.state
             async for event in session:
+                subscribed = state.subscribed_types
+                if (
+                    subscribed is not None
+                    and event.type not in subscribed
+                    and event.type not in _UNFILTERED_EVENTS
+                    and not EventDispatcher.handles(event.type)
+                ):
+                    # Nobody wants it and no state depends on it: skip serialize, dispatch and send.
+                    continue
+                if (
+                    conn.outgoing.full()
+                    and EventDispatcher.delta_is_noop(state)
+                    and EventSerializer.peek_type(event) in _DROPPABLE_DELTAS
+                ):
+                    # The client is behind and this delta would be dropped at enqueue anyway.
+                    state.metrics.dropped_frames += 1
+                    continue
+                # One clock read per event; handlers and metrics share it.
+                now_ns = time.monotonic_ns()
                 # Serialize event (pure, no side-effects)
                 serialized_event = EventSerializer.serialize(event)
 
-                # Dispatch to lifecycle handlers (updates state)
-                extra_msgs = await self.dispatcher.dispatch(session_id, serialized_event)
+                # Dispatch to lifecycle handlers (updates state, may attach metrics/interrupted);
+                # most raw server events have neither a handler nor a transcript, so skip the call.
+                if EventDispatcher.needs_dispatch(serialized_event):
+                    await self.dispatcher.dispatch(session_id, serialized_event, now_ns)
 
                 evt_type = serialized_event.get("type")
-                # Drop chatty events first if outbound queue backs up.
-                drop_base = evt_type in {
-                    "response.text.delta",
-                    "response.audio.delta",
-                    "history_updated",
-                    "history_added",
-                }
-                await self.send_json(session_id, serialized_event, drop_if_full=drop_base)
-                for extra in extra_msgs:
-                    await self.send_json(session_id, extra, drop_if_full=True)
-
-                # TTS handling (special case: trigger audio generation)
-                if self.tts_service and serialized_event.get("type") == "response.output_text.done":
-                    transcript = state.last_transcript or serialized_event.get("transcript")
-                    if transcript:
-                        state.last_transcript = transcript
-                        await self.cancel_tts(session_id)
-                        task = asyncio.create_task(self._stream_response(session_id, transcript))
-                        state.audio_task = task
-                        conn.tts_task = task
-                        self.audio_tasks[session_id] = task
-                        task.add_done_callback(lambda t: self.audio_tasks.pop(session_id, None))
+                if subscribed is None or evt_type in subscribed or evt_type == "error":
+                    await self._forward_event(conn, evt_type, serialized_event)
+                else:
+                    await self._forward_attached(session_id, serialized_event)
+
+                handler = _EVENT_HANDLERS.get(evt_type)
+                if handler:
+                    await handler(self, conn, serialized_event, now_ns)
 
         except Exception as e:
+            if ready is not None and not ready.done():
+                ready.set_exception(e)
             self._logger.error("Error processing events for session %s: %s", session_id, e)
         finally:
+            if ready is not None and not ready.done():
+                # Torn down mid-setup: release anyone still waiting for the session.
+                ready.cancel()
             if not conn.closed:
-                asyncio.create_task(self.disconnect(session_id))
+                self.spawn(self.disconnect(session_id))
+
+    async def _forward_event(self, conn: Connection, evt_type: Optional[str], serialized_event: dict[str, Any]) -> None:
+        """Send one serialized model event to the client in its wire format."""
+        session_id = conn.session_id
+        if evt_type == "audio":
+            # PCM goes out raw in a binary frame; the rest of the event rides in its header.
+            header = dict(serialized_event)
+            pcm = header.pop("audio")
+            await self.send_bytes(session_id, encode_audio_frame(pcm, header))
+        elif evt_type == "history_updated":
+            await self._forward_history(conn, serialized_event["history"])
+        elif len(serialized_event) == 2 and serialized_event.get("raw_model_event") == _BARE_RAW_EVENT:
+            # Streaming deltas serialize to just their type; reuse the encoded frame per type.
+            text = _BARE_EVENT_TEXT.get(evt_type)
+            if text is None:
+                text = _BARE_EVENT_TEXT[evt_type] = orjson.dumps(serialized_event).decode()
+            await self.send_text(session_id, text, drop_if_full=evt_type in _CHATTY_EVENTS)
+        else:
+            # Drop chatty events first if outbound queue backs up.
+            sent = await self.send_json(session_id, serialized_event, drop_if_full=evt_type in _CHATTY_EVENTS)
+            if sent and evt_type == "history_added" and "item" in serialized_event:
+                conn.state.sent_history.append(serialized_event["item"])
+
+    async def _forward_attached(self, session_id: str, serialized_event: dict[str, Any]) -> None:
+        """Send the metrics/interrupted a filtered-out event carried as standalone frames."""
+        metrics = serialized_event.get("metrics")
+        if metrics:
+            await self.send_text(session_id, _METRICS_PREFIX + orjson.dumps(metrics).decode() + "}", drop_if_full=True)
+        if serialized_event.get("interrupted"):
+            # Barge-in must reach the client even when it only subscribed to a few types.
+            await self.send_text(session_id, _INTERRUPTED_TEXT)
+
+    async def _forward_history(self, conn: Connection, history: list[dict[str, Any]]) -> None:
+        """Send a history snapshot as the smallest equivalent update against what the client has."""
+        state = conn.state
+        sent = state.sent_history
+        sent_len = len(sent)
+        added = len(history) - sent_len
+        if 0 <= added <= _HISTORY_DELTA_MAX:
+            subscribed = state.subscribed_types
+            # Sanitized items are cached per SDK item, so unchanged entries compare by identity first.
+            if history[:sent_len] == sent:
+                if added == 0:
+                    # Snapshots often repeat unchanged (e.g. only stripped audio moved).
+                    return
+                if subscribed is None or "history_added" in subscribed:
+                    # Pure append: the client renders history_added items the same way.
+                    items = history[sent_len:]
+                    texts = [orjson.dumps({"type": "history_added", "item": item}).decode() for item in items]
+                    if await self.send_texts(conn.session_id, texts):
+                        sent.extend(items)
+                    return
+            elif subscribed is None or "history_delta" in subscribed:
+                # Items rewritten in place (e.g. a transcript landing on an earlier turn): send just those.
+                changed = [i for i in range(sent_len) if history[i] != sent[i]]
+                if len(changed) <= _HISTORY_DELTA_MAX and all(
+                    history[i].get("item_id") == sent[i].get("item_id") for i in changed
+                ):
+                    items = history[sent_len:]
+                    delta = {"type": "history_delta", "updated": [history[i] for i in changed], "added": items}
+                    if await self.send_json(conn.session_id, delta):
+                        for i in changed:
+                            sent[i] = history[i]
+                        sent.extend(items)
+                    return
+        if await self.send_json(conn.session_id, {"type": "history_updated", "history": history}, drop_if_full=True):
+            state.sent_history = list(history)
+
+    async def _handle_text_done(self, conn: Connection, serialized_event: dict[str, Any], now_ns: int) -> None:
+        """Start TTS for a finished text response, replacing any in-flight stream."""
+        if not self.tts_service or not conn.state.tts_enabled:
+            return
+        session_id = conn.session_id
+        state = conn.state
+        transcript = state.last_transcript or serialized_event.get("transcript")
+        if not transcript:
+            return
+        state.last_transcript = transcript
+        # Partial/final duplicates of the same response would otherwise pay for a second stream.
+        transcript_hash = hash(transcript)
+        if transcript_hash == state.last_tts_transcript_hash:
+            return
+        state.last_tts_transcript_hash = transcript_hash
+        await self.cancel_tts(session_id)
+        # conn.tts_task is the only handle; cancel_tts and disconnect both go through it.
+        conn.tts_task = _eager_task(self._stream_response(session_id, transcript))
 
     async def _stream_response(self, session_id: str, transcript: str) -> None:
         """Stream TTS audio chunks via the outbound writer queue."""
-        start = time.time()
+        start_ns = time.monotonic_ns()
         state = self.session_states.get(session_id)
         if not state:
             return
 
         # Mark TTS ready time for metrics (consistent with dispatcher)
-        state.metrics["tts_ready_time"] = time.time()
+        state.metrics.tts_ready_ns = start_ns
 
+        pool = self._frame_pool
+        frame_bytes = pool.frame_bytes
+        # TTS bytes are copied once, straight into pooled frames behind the empty 4-byte header.
+        frame: Optional[bytearray] = None
+        fill = 4
         try:
-            await self.send_json(session_id, {"type": "audio_start"}, drop_if_full=False)
-            buffer = bytearray()
+            await self.send_text(session_id, _AUDIO_START_TEXT, audio=True)
             first_chunk_sent = False
 
             async for audio_chunk in self.tts_service.stream_audio(transcript):
                 if not audio_chunk:
                     continue
-                buffer.extend(audio_chunk)
-                while len(buffer) >= self._tts_chunk_bytes:
-                    chunk_to_send = bytes(buffer[: self._tts_chunk_bytes])
-                    del buffer[: self._tts_chunk_bytes]
-                    await self.send_bytes(session_id, chunk_to_send)
+                src = memoryview(audio_chunk).cast("B")
+                pos = 0
+                while pos < len(src):
+                    if frame is None:
+                        frame = pool.acquire()
+                    n = min(frame_bytes - fill, len(src) - pos)
+                    frame[fill:fill + n] = src[pos:pos + n]
+                    fill += n
+                    pos += n
+                    if fill < frame_bytes:
+                        break
+                    full, frame, fill = frame, None, 4
+                    if not await self.send_bytes(session_id, full, release=pool.release):
+                        pool.release(full)
+                        return
                     if not first_chunk_sent:
                         first_chunk_sent = True
-                        now = time.time()
-                        data: dict[str, Any] = {}
-                        speech_end = state.metrics.get("speech_end_time")
-                        if speech_end:
-                            data["turn"] = round((now - speech_end) * 1000, 2)
-                        tts_ready = state.metrics.get("tts_ready_time")
-                        if tts_ready:
-                            data["tts"] = round((now - tts_ready) * 1000, 2)
-                        if data:
-                            await self.send_json(session_id, {"type": "metrics", "data": data}, drop_if_full=True)
-
-            if buffer:
-                await self.send_bytes(session_id, bytes(buffer))
+                        now_ns = time.monotonic_ns()
+                        speech_end_ns = state.metrics.speech_end_ns
+                        if speech_end_ns:
+                            state.pending_metrics["turn"] = (now_ns - speech_end_ns) // 1_000_000
+                        tts_ready_ns = state.metrics.tts_ready_ns
+                        if tts_ready_ns:
+                            state.pending_metrics["tts"] = (now_ns - tts_ready_ns) // 1_000_000
+                        await self._flush_metrics(session_id)
+
+            if frame is not None and fill > 4:
+                # The short tail goes out as a view of its slab; the writer returns the slab after sending.
+                tail, frame = memoryview(frame)[:fill], None
+                if not await self.send_bytes(session_id, tail, release=pool.release_view):
+                    pool.release_view(tail)
         except asyncio.CancelledError:
             self._logger.info("TTS streaming cancelled for session %s", session_id)
+            await self._flush_metrics(session_id)
             raise
         except Exception as e:
             self._logger.error("Error during TTS streaming for session %s: %s", session_id, e)
         finally:
-            elapsed = (time.time() - start) * 1000
-            self._logger.info("_stream_response completed in %.2f ms for session %s", elapsed, session_id)
+            if frame is not None:
+                pool.release(frame)
+            self._logger.debug(
+                "_stream_response completed in %d ms for session %s", (time.monotonic_ns() - start_ns) // 1_000_000, session_id
+            )
+
+    async def _flush_metrics(self, session_id: str) -> None:
+        """Send all pending metrics for the session as a single metrics frame."""
+        state = self.session_states.get(session_id)
+        if not state or not state.pending_metrics:
+            return
+        data, state.pending_metrics = state.pending_metrics, {}
+        await self.send_text(session_id, _METRICS_PREFIX + orjson.dumps(data).decode() + "}", drop_if_full=True)
+
+    def parse_json_int16_audio(self, samples: list[int]) -> memoryview:
+        """Convert JSON int16 arrays into a little-endian PCM byte view without a tobytes() copy."""
+        # fromiter with a known count fills one preallocated buffer; '<i2' fixes the byte order on any host.
+        pcm = np.fromiter(samples, dtype="<i2", count=len(samples))
+        return memoryview(pcm).cast("B")
 
-    def parse_json_int16_audio(self, samples: list[int]) -> bytes:
-        """Convert JSON int16 arrays into PCM bytes without per-sample packing."""
-        pcm = array("h", samples)
-        if sys.byteorder != "little":
-            pcm.byteswap()
-        return pcm.tobytes()
 
+# Per-event-type side effects run by _process_events after the event is forwarded.
+_EVENT_HANDLERS: dict[str, Callable[[RealtimeWebSocketManager, Connection, dict[str, Any], int], Awaitable[None]]] = {
+    "response.output_text.done": RealtimeWebSocketManager._handle_text_done,
+}
 
 manager = RealtimeWebSocketManager()
@@ -1,62 +1,152 @@
 import asyncio
-from asyncio.log import logger
-import json
-from typing import Any
+import base64
+import binascii
+import importlib.util
+import logging
+from typing import Any, Awaitable, Callable
+
+import orjson
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.responses import FileResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from agent.companion import manager
 from agents.realtime.config import RealtimeUserInputMessage
 
+logger = logging.getLogger(__name__)
+
+# Constant error replies, encoded once at import.
+_JSON_AUDIO_DISABLED_TEXT = orjson.dumps({"type": "error", "error": "Send audio as binary frames."}).decode()
+_EMPTY_TEXT_ERROR_TEXT = orjson.dumps({"type": "error", "error": "Empty text message."}).decode()
+_BAD_AUDIO_B64_TEXT = orjson.dumps({"type": "error", "error": "Invalid base64 audio."}).decode()
+_BAD_SUBSCRIBE_TEXT = orjson.dumps(
+    {"type": "error", "error": "subscribe types must be a list of strings or null."}
+).decode()
+# Read-only client event; send_client_event never mutates what it is given.
+_COMMIT_AUDIO_EVENT: dict[str, Any] = {"type": "input_audio_buffer.commit"}
+# Bound once so the receive loop skips the attribute lookup per frame.
+_loads = orjson.loads
+# JSON int16 audio is deprecated in favour of binary frames; warn once per process.
+_json_audio_warned = False
+
+
 async def lifespan(app: FastAPI):
+    # Surface which loop uvicorn picked (uvloop when installed) so deployments can verify it.
+    loop_module = type(asyncio.get_running_loop()).__module__
+    logger.info("Event loop: %s", loop_module)
+    if not loop_module.startswith("uvloop") and importlib.util.find_spec("uvloop") is not None:
+        logger.warning("uvloop is installed but not in use; start uvicorn with --loop uvloop (or the default auto)")
     yield
+    if manager.tts_service.cartesia_tts is not None:
+        manager.tts_service.cartesia_tts.close()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+
+
+async def _handle_audio(session_id: str, message: dict[str, Any]) -> None:
+    global _json_audio_warned
+    if not manager.json_audio_enabled:
+        await manager.send_text(session_id, _JSON_AUDIO_DISABLED_TEXT, drop_if_full=True)
+        return
+    if not _json_audio_warned:
+        _json_audio_warned = True
+        logger.warning("Client sent JSON audio (session %s); send raw PCM16 binary frames instead", session_id)
+    int16_data = message.get("data") or []
+    audio_bytes = manager.parse_json_int16_audio(int16_data)
+    await manager.send_audio(session_id, audio_bytes)
+
+
+async def _handle_audio_b64(session_id: str, message: dict[str, Any]) -> None:
+    # For clients that can only send text frames: one C-level decode instead of a JSON number per sample.
+    try:
+        audio_bytes = base64.b64decode(message.get("b64") or "", validate=True)
+    except binascii.Error:
+        await manager.send_text(session_id, _BAD_AUDIO_B64_TEXT, drop_if_full=True)
+        return
+    await manager.send_audio(session_id, audio_bytes)
+
+
+async def _handle_text(session_id: str, message: dict[str, Any]) -> None:
+    text_content = message.get("text")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Received text message from client (session %s): %s", session_id, str(text_content)[:200])
+    if text_content:
+        user_msg: RealtimeUserInputMessage = {
+            "type": "message",
+            "role": "user",
+            "content": [{"type": "input_text", "text": text_content}],
+        }
+        await manager.send_user_message(session_id, user_msg)
+    else:
+        await manager.send_text(session_id, _EMPTY_TEXT_ERROR_TEXT, drop_if_full=True)
 
 
-app = FastAPI(lifespan=lifespan)
+async def _handle_commit_audio(session_id: str, message: dict[str, Any]) -> None:
+    await manager.send_client_event(session_id, _COMMIT_AUDIO_EVENT)
+
+
+async def _handle_client_vad_speech_start(session_id: str, message: dict[str, Any]) -> None:
+    manager.request_interrupt(session_id)
+    await manager.cancel_tts(session_id)
+
+
+async def _handle_interrupt(session_id: str, message: dict[str, Any]) -> None:
+    manager.request_interrupt(session_id)
+
+
+async def _handle_enable_tts(session_id: str, message: dict[str, Any]) -> None:
+    await manager.enable_tts(session_id, bool(message.get("enabled", True)))
+
+
+async def _handle_subscribe(session_id: str, message: dict[str, Any]) -> None:
+    types = message.get("types")
+    if types is not None and not (isinstance(types, list) and all(isinstance(t, str) for t in types)):
+        # A bare string would become a set of characters; keep the current subscription instead.
+        await manager.send_text(session_id, _BAD_SUBSCRIBE_TEXT, drop_if_full=True)
+        return
+    manager.set_subscriptions(session_id, types)
+
+
+# Client message type -> handler, resolved once at import; unknown types are ignored.
+_HANDLERS: dict[str, Callable[[str, dict[str, Any]], Awaitable[None]]] = {
+    "audio": _handle_audio,
+    "audio_b64": _handle_audio_b64,
+    "text": _handle_text,
+    "commit_audio": _handle_commit_audio,
+    "client_vad_speech_start": _handle_client_vad_speech_start,
+    "interrupt": _handle_interrupt,
+    "enable_tts": _handle_enable_tts,
+    "subscribe": _handle_subscribe,
+}
 
 
 @app.websocket("/ws/{session_id}")
 async def websocket_endpoint(websocket: WebSocket, session_id: str):
     await manager.connect(websocket, session_id)
+    # Frames can be binary or text, so read raw ASGI messages; bound once for the receive loop.
+    receive = websocket.receive
+    send_audio = manager.send_audio
+    handlers = _HANDLERS
     try:
         while True:
-            packet: dict[str, Any] = await websocket.receive()
-            if packet.get("type") == "websocket.disconnect":
-                break
-            if packet.get("bytes") is not None:
-                await manager.send_audio(session_id, packet["bytes"])
+            packet: dict[str, Any] = await receive()
+            # Binary audio is the hot path: one lookup, no JSON, straight to the model.
+            data = packet.get("bytes")
+            if data is not None:
+                await send_audio(session_id, data)
                 continue
-            if packet.get("text") is None:
+            text = packet.get("text")
+            if text is None:
+                if packet["type"] == "websocket.disconnect":
+                    break
                 continue
 
-            message = json.loads(packet["text"])
-            msg_type = message.get("type")
-
-            if msg_type == "audio":
-                int16_data = message.get("data") or []
-                audio_bytes = manager.parse_json_int16_audio(int16_data)
-                await manager.send_audio(session_id, audio_bytes)
-            elif msg_type == "text":
-                text_content = message.get("text")
-                logger.info("Received text message from client (session %s): %s", session_id, text_content)
-                if text_content:
-                    user_msg: RealtimeUserInputMessage = {
-                        "type": "message",
-                        "role": "user",
-                        "content": [{"type": "input_text", "text": text_content}],
-                    }
-                    await manager.send_user_message(session_id, user_msg)
-                else:
-                    await manager.send_json(session_id, {"type": "error", "error": "Empty text message."}, drop_if_full=True)
-            elif msg_type == "commit_audio":
-                await manager.send_client_event(session_id, {"type": "input_audio_buffer.commit"})
-            elif msg_type == "client_vad_speech_start":
-                asyncio.create_task(manager.interrupt(session_id))
-                await manager.cancel_tts(session_id)
-            elif msg_type == "interrupt":
-                asyncio.create_task(manager.interrupt(session_id))
+            message = _loads(text)
+            handler = handlers.get(message.get("type"))
+            if handler is not None:
+                await handler(session_id, message)
 
     except WebSocketDisconnect:
         pass
@@ -64,20 +154,26 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
         await manager.disconnect(session_id)
 
 
+# html=True serves static/index.html for "/", so no separate index route is needed.
 app.mount("/", StaticFiles(directory="static", html=True), name="static")
 
 
-@app.get("/")
-async def read_index():
-    return FileResponse("static/index.html")
-
-
 if __name__ == "__main__":
+    import sys
+
     import uvicorn
 
+    # Ask for the fast implementations by name so a missing uvloop/httptools fails at startup
+    # instead of silently falling back (uvloop has no Windows build).
     uvicorn.run(
         app,
         host="0.0.0.0",
         port=8001,
         ws_max_size=16 * 1024 * 1024,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        ws="websockets",
+        # Deflate would run over every PCM frame, which barely compresses; JSON frames are small.
+        ws_per_message_deflate=False,
+        access_log=False,
     )
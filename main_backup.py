@@ -1,18 +1,18 @@
 import asyncio
 import base64
-import json
 import logging
 import os
-import struct
+import sys
+import time
 import array
 from contextlib import asynccontextmanager
-from typing import TYPE_CHECKING, Any, Optional
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Optional
 
 from dotenv import load_dotenv
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
-from typing_extensions import assert_never
+import numpy as np
+import orjson
 
 # Load environment variables from .env file
 load_dotenv()
@@ -34,29 +34,91 @@ def convert_float32_to_int16(audio_bytes: bytes) -> bytes:
     if num_samples == 0:
         return b''
     
-    # Unpack float32 samples (little-endian)
-    float_samples = struct.unpack(f'<{num_samples}f', audio_bytes)
+    # View float32 samples (little-endian) without unpacking them into Python floats
+    float_samples = np.frombuffer(audio_bytes, dtype='<f4', count=num_samples)
     
-    # Convert to int16
-    int16_samples = []
-    for sample in float_samples:
-        # Clamp between -1.0 and 1.0
-        sample = max(-1.0, min(1.0, sample))
-        # Scale to int16 range (-32768 to 32767)
-        int16_sample = int(sample * 32767)
-        int16_samples.append(int16_sample)
+    # Widen to float64 (matching Python float math), clamp between -1.0 and 1.0, then scale in place
+    scaled = float_samples.astype(np.float64)
+    np.clip(scaled, -1.0, 1.0, out=scaled)
+    scaled *= 32767
     
-    # Pack int16 samples (little-endian)
-    return struct.pack(f'<{num_samples}h', *int16_samples)
+    # Truncate toward zero like int(), pack as int16 (little-endian)
+    return scaled.astype('<i2').tobytes()
+
+
+# Binary audio frames are [u32 LE header length][JSON header][PCM16], as the bundled client expects.
+# Cartesia chunks carry no header; model audio carries its type. Both headers have even length,
+# so the PCM stays 2-byte aligned for the client's Int16Array view.
+_TTS_FRAME_PREFIX = (0).to_bytes(4, "little")
+_MODEL_AUDIO_HEADER = orjson.dumps({"type": "audio"})
+_MODEL_AUDIO_FRAME_PREFIX = len(_MODEL_AUDIO_HEADER).to_bytes(4, "little") + _MODEL_AUDIO_HEADER
+
+
+class _AudioFrameBuffer:
+    """Reusable frame for one audio sender: the prefix is written once and each chunk copied in after it."""
+
+    __slots__ = ("_prefix_len", "_buf")
+
+    def __init__(self, prefix: bytes, capacity: int = 4096):
+        self._prefix_len = len(prefix)
+        self._buf = bytearray(prefix) + bytearray(capacity)
+
+    def frame(self, chunk: bytes) -> memoryview:
+        """View of prefix + chunk, valid until the next call. Send it before framing another chunk."""
+        end = self._prefix_len + len(chunk)
+        if len(self._buf) < end:
+            # Grow by swapping in a new buffer: resizing one with live views raises BufferError
+            self._buf = self._buf[:self._prefix_len] + bytearray(end - self._prefix_len)
+        self._buf[self._prefix_len:end] = chunk
+        return memoryview(self._buf)[:end]
+
+# Minimum seconds between image_chunk_ack progress messages for one image upload.
+_IMAGE_ACK_INTERVAL = 0.25
+# Unfinished chunked images kept per connection; starting another evicts the oldest.
+_MAX_PENDING_IMAGES = 4
+
+# Events queued per connection before _process_events waits on a slow client, and the most
+# events joined into one JSON array frame (the bundled client accepts either shape).
+_EVENT_QUEUE_MAX = 512
+_EVENT_BATCH_MAX = 32
+# Audio chunks (model + Cartesia) queued per connection before their producers wait.
+_AUDIO_QUEUE_MAX = 256
+
+
+class _Outbox:
+    """Outbound lanes for one connection; only the session's writer task sends on the socket."""
+
+    __slots__ = ("events", "audio", "wakeup")
+
+    def __init__(self):
+        self.events: asyncio.Queue[str] = asyncio.Queue(maxsize=_EVENT_QUEUE_MAX)
+        # (frame prefix, PCM) pairs; the writer frames them as it sends
+        self.audio: asyncio.Queue[tuple[bytes, bytes]] = asyncio.Queue(maxsize=_AUDIO_QUEUE_MAX)
+        self.wakeup = asyncio.Event()
+
+    async def put_event(self, text: str, droppable: bool = False) -> None:
+        if droppable:
+            # Client is behind: drop chatty events instead of stalling the session
+            try:
+                self.events.put_nowait(text)
+            except asyncio.QueueFull:
+                return
+        else:
+            await self.events.put(text)
+        self.wakeup.set()
+
+    async def put_audio(self, prefix: bytes, pcm: bytes) -> None:
+        await self.audio.put((prefix, pcm))
+        self.wakeup.set()
 
 from agents.realtime import RealtimeRunner, RealtimeSession, RealtimeSessionEvent
 from agents.realtime.config import RealtimeUserInputMessage, RealtimeRunConfig
-from agents.realtime.items import RealtimeItem
 from agents.realtime.model import RealtimeModelConfig
 from agents.realtime.model_inputs import RealtimeModelSendRawMessage
 
 # Import Cartesia TTS service
 from agent.cartesia_tts import CartesiaTTS, get_cartesia_tts
+from agent.core.dispatcher import EventSerializer
 
 # Import TwilioHandler class - handle both module and package use cases
 if TYPE_CHECKING:
@@ -75,6 +137,26 @@ else:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Session config is the same for every connection: built once from env at import.
+_RUN_CONFIG = RealtimeRunConfig(async_tool_calls=False)
+_MODEL_CONFIG: RealtimeModelConfig = {
+    "initial_model_settings": {
+        "turn_detection": {
+            "type": "server_vad",
+            "prefix_padding_ms": 300,
+            "silence_duration_ms": 500,
+            "interrupt_response": True,
+            "create_response": True,
+        },
+        "input_audio_transcription": {
+            "model": "gpt-4o-transcribe"
+        },
+        "output_modalities": ['text']  # Only text output when using Cartesia TTS
+    },
+    "api_key": os.getenv("AZURE_OPENAI_API_KEY"),
+    "url": os.getenv("AZURE_OPENAI_REALTIME_URL"),
+}
+
 
 class RealtimeWebSocketManager:
     def __init__(self):
@@ -83,42 +165,43 @@ class RealtimeWebSocketManager:
         self.websockets: dict[str, WebSocket] = {}
         self.cartesia_tts: Optional[CartesiaTTS] = None
         self.use_cartesia_tts: bool = False  # Flag to enable/disable Cartesia TTS
+        # In-flight Cartesia stream per session, run beside event forwarding
+        self._tts_tasks: dict[str, asyncio.Task] = {}
+        # Outbound events/audio per session and the task that writes them onto the socket
+        self._outboxes: dict[str, _Outbox] = {}
+        self._event_writers: dict[str, asyncio.Task] = {}
+        self._event_processors: dict[str, asyncio.Task] = {}
+        # Shared by every session; replace on the manager to override the env defaults
+        self.runner_config: RealtimeRunConfig = _RUN_CONFIG
+        self.model_config: RealtimeModelConfig = _MODEL_CONFIG
 
     async def connect(self, websocket: WebSocket, session_id: str):
         await websocket.accept()
         self.websockets[session_id] = websocket
+        outbox = _Outbox()
+        self._outboxes[session_id] = outbox
+        self._event_writers[session_id] = asyncio.create_task(
+            self._write_events(session_id, websocket, outbox)
+        )
 
         agent = get_starting_agent()
         # runner = RealtimeRunner(agent)
         # If you want to customize the runner behavior, you can pass options:
-        runner_config = RealtimeRunConfig(async_tool_calls=False)
-        runner = RealtimeRunner(agent, config=runner_config)
-        model_config: RealtimeModelConfig = {
-            "initial_model_settings": {
-                "turn_detection": {
-                    "type": "server_vad",
-                    "prefix_padding_ms": 300,
-                    "silence_duration_ms": 500,
-                    "interrupt_response": True,
-                    "create_response": True,
-                },
-                "input_audio_transcription": {
-                    "model": "gpt-4o-transcribe"
-                },
-                "output_modalities": ['text']  # Only text output when using Cartesia TTS
-            },
-            "api_key": os.getenv("AZURE_OPENAI_API_KEY"),
-            "url": os.getenv("AZURE_OPENAI_REALTIME_URL"),
-        }
-        session_context = await runner.run(model_config=model_config)
+        runner = RealtimeRunner(agent, config=self.runner_config)
+        session_context = await runner.run(model_config=self.model_config)
         session = await session_context.__aenter__()
         self.active_sessions[session_id] = session
         self.session_contexts[session_id] = session_context
 
         # Start event processing task
-        asyncio.create_task(self._process_events(session_id))
+        self._event_processors[session_id] = asyncio.create_task(self._process_events(session_id))
 
     async def disconnect(self, session_id: str):
+        self._cancel_session_tasks(session_id)
+        event_writer = self._event_writers.pop(session_id, None)
+        if event_writer is not None:
+            event_writer.cancel()
+        self._outboxes.pop(session_id, None)
         if session_id in self.session_contexts:
             await self.session_contexts[session_id].__aexit__(None, None, None)
             del self.session_contexts[session_id]
@@ -127,6 +210,19 @@ class RealtimeWebSocketManager:
         if session_id in self.websockets:
             del self.websockets[session_id]
 
+    def _cancel_session_tasks(self, session_id: str) -> None:
+        """Stop event forwarding and any Cartesia stream for a session."""
+        for tasks in (self._event_processors, self._tts_tasks):
+            task = tasks.pop(session_id, None)
+            if task is not None:
+                task.cancel()
+
+    async def send_event(self, session_id: str, event: dict[str, Any]) -> None:
+        """Queue a JSON event for the client on the session's writer."""
+        outbox = self._outboxes.get(session_id)
+        if outbox is not None:
+            await outbox.put_event(orjson.dumps(event).decode())
+
     async def send_audio(self, session_id: str, audio_bytes: bytes):
         if session_id in self.active_sessions:
             await self.active_sessions[session_id].send_audio(audio_bytes)
@@ -216,44 +312,80 @@ class RealtimeWebSocketManager:
     async def _process_events(self, session_id: str):
         try:
             session = self.active_sessions[session_id]
-            websocket = self.websockets[session_id]
+            outbox = self._outboxes[session_id]
 
             async for event in session:
-                event_data = await self._serialize_event(event)
+                if event.type == "audio":
+                    # Raw PCM in a binary frame: no base64 expansion, no JSON, no per-chunk concatenation
+                    await outbox.put_audio(_MODEL_AUDIO_FRAME_PREFIX, event.audio.data)
+                    continue
+                # One pass over the event: the dict for the client plus the finished response text, if any
+                event_data, transcript = await self._serialize_event(event)
                 
                 # If Cartesia TTS is enabled and we have a text response, generate audio
-
-                event_type = (
-                    event_data.get("type")
-                    if isinstance(event_data, dict)
-                    else getattr(event_data, "type", None)
-                )
+                if self.use_cartesia_tts and transcript:
+                    logger.info(f"Generating audio for transcript: {transcript[:50]}...")
+                    # Stream audio with Cartesia in the background so model events keep flowing;
+                    # a newer response replaces the previous stream
+                    previous = self._tts_tasks.pop(session_id, None)
+                    if previous is not None:
+                        previous.cancel()
+                    self._tts_tasks[session_id] = asyncio.create_task(
+                        self._pump_cartesia(session_id, outbox, transcript)
+                    )
                 
-                transcript = (
-                    event_data.get("transcript")
-                    if isinstance(event_data, dict)
-                    else getattr(event_data, "transcript", None)
+                # Under backpressure only streaming deltas (same set as the main server) and full
+                # history snapshots, which the next snapshot replaces, may be dropped
+                droppable = (
+                    event_data["type"] in EventSerializer.DELTA_EVENT_TYPES or event.type == "history_updated"
                 )
-                if self.use_cartesia_tts and event_type == "response.output_text.done" and transcript != None:
-                    # Extract transcript from the event
-                    if transcript:
-                        logger.info(f"Generating audio for transcript: {transcript[:50]}...")
-                        # Stream audio with Cartesia
-                        async for audio_chunk in self.stream_cartesia_audio(transcript):
-                            if audio_chunk:
-                                # Send audio event to client
-                                audio_event = {
-                                    "type": "audio",
-                                    "audio": base64.b64encode(audio_chunk).decode("utf-8"),
-                                    "source": "cartesia"
-                                }
-                                await websocket.send_text(json.dumps(audio_event))
-                
-                await websocket.send_text(json.dumps(event_data))
+                await outbox.put_event(orjson.dumps(event_data).decode(), droppable=droppable)
         except Exception as e:
             print(e)
             logger.error(f"Error processing events for session {session_id}: {e}")
     
+    async def _write_events(self, session_id: str, websocket: WebSocket, outbox: _Outbox) -> None:
+        """The only sender on the socket: queued audio first, then events joined into one array frame."""
+        # Frames are built in place right before each send, one reused buffer per prefix
+        audio_frames = {
+            prefix: _AudioFrameBuffer(prefix) for prefix in (_TTS_FRAME_PREFIX, _MODEL_AUDIO_FRAME_PREFIX)
+        }
+        events, audio, wakeup = outbox.events, outbox.audio, outbox.wakeup
+        try:
+            while True:
+                if audio.empty() and events.empty():
+                    wakeup.clear()
+                    await wakeup.wait()
+                    continue
+                # Only the audio queued now, so events still go out every pass
+                for _ in range(audio.qsize()):
+                    prefix, pcm = audio.get_nowait()
+                    await websocket.send_bytes(audio_frames[prefix].frame(pcm))
+                texts: list[str] = []
+                while len(texts) < _EVENT_BATCH_MAX and not events.empty():
+                    texts.append(events.get_nowait())
+                if texts:
+                    await websocket.send_text(texts[0] if len(texts) == 1 else "[" + ",".join(texts) + "]")
+        except Exception as e:
+            logger.info(f"Event writer stopped for session {session_id}: {e}")
+            # Nothing drains the queues any more: stop producing into them and close the socket,
+            # so the endpoint's receive loop ends and disconnect() tears the session down
+            self._cancel_session_tasks(session_id)
+            try:
+                await websocket.close(code=1011)
+            except Exception:
+                pass
+
+    async def _pump_cartesia(self, session_id: str, outbox: _Outbox, transcript: str) -> None:
+        """Stream Cartesia audio for one transcript to the client."""
+        try:
+            async for audio_chunk in self.stream_cartesia_audio(transcript):
+                if audio_chunk:
+                    # Raw PCM goes out as a header-less binary frame on the session's writer
+                    await outbox.put_audio(_TTS_FRAME_PREFIX, audio_chunk)
+        except Exception as e:
+            logger.error(f"Error streaming Cartesia audio for session {session_id}: {e}")
+
     async def stream_cartesia_audio(self, transcript: str) -> AsyncGenerator[bytes, None]:
         """
         Stream audio using Cartesia TTS from a text transcript.
@@ -275,149 +407,13 @@ class RealtimeWebSocketManager:
              logger.error(f"Error streaming audio with Cartesia: {e}")
              return
     
-    def _extract_transcript_from_event(self, event: RealtimeSessionEvent) -> Optional[str]:
-        """
-        Extract transcript text from a raw_model_event.
-        
-        Args:
-            event: The realtime session event
-            
-        Returns:
-            Transcript text if found, None otherwise
-        """
-        if event.type != "raw_model_event":
-            return None
-        
-        try:
-            raw = event.data
-            data = getattr(raw, "data", None) or getattr(raw, "message", None) or raw
-            
-            if isinstance(data, dict):
-                # Check for transcript at top level
-                if "transcript" in data:
-                    return data["transcript"]
-                
-                # Check for transcript in item/content
-                item = data.get("item") or data.get("conversation_item")
-                if isinstance(item, dict):
-                    content = item.get("content")
-                    if isinstance(content, list):
-                        for part in content:
-                            if isinstance(part, dict) and "transcript" in part:
-                                return part["transcript"]
-            
-            return None
-        except Exception as e:
-            logger.error(f"Error extracting transcript from event: {e}")
-            return None
-
-    def _sanitize_history_item(self, item: RealtimeItem) -> dict[str, Any]:
-        """Remove large binary payloads from history items while keeping transcripts."""
-        item_dict = item.model_dump()
-        content = item_dict.get("content")
-        if isinstance(content, list):
-            sanitized_content: list[Any] = []
-            for part in content:
-                if isinstance(part, dict):
-                    sanitized_part = part.copy()
-                    if sanitized_part.get("type") in {"audio", "input_audio"}:
-                        sanitized_part.pop("audio", None)
-                    sanitized_content.append(sanitized_part)
-                else:
-                    sanitized_content.append(part)
-            item_dict["content"] = sanitized_content
-        return item_dict
-    
-    def unwrap_data(self, x):
-        """
-        Trả về dữ liệu bên trong theo kiểu an toàn:
-        - nếu x là dict: trả về x
-        - nếu x là object có .data: bóc tiếp
-        - nếu không bóc được: trả về None
-        """
-        while True:
-            if x is None:
-                return None
-            if isinstance(x, dict):
-                return x
-            if hasattr(x, "data"):
-                x = getattr(x, "data")
-                continue
-            return None
-
-    async def _serialize_event(self, event: RealtimeSessionEvent) -> dict[str, Any]:
-        base_event: dict[str, Any] = {
-            "type": event.type,
-        }
-        
-        if event.type == "agent_start":
-            base_event["agent"] = event.agent.name
-        elif event.type == "agent_end":
-            base_event["agent"] = event.agent.name
-        elif event.type == "handoff":
-            base_event["from"] = event.from_agent.name
-            base_event["to"] = event.to_agent.name
-        elif event.type == "tool_start":
-            base_event["tool"] = event.tool.name
-        elif event.type == "tool_end":
-            base_event["tool"] = event.tool.name
-            base_event["output"] = str(event.output)
-        elif event.type == "audio":
-            base_event["audio"] = base64.b64encode(event.audio.data).decode("utf-8")
-        elif event.type == "audio_interrupted":
-            pass
-        elif event.type == "audio_end":
-            pass
-        elif event.type == "history_updated":
-            base_event["history"] = [self._sanitize_history_item(item) for item in event.history]
-        elif event.type == "history_added":
-            # Provide the added item so the UI can render incrementally.
-            try:
-                base_event["item"] = self._sanitize_history_item(event.item)
-            except Exception:
-                base_event["item"] = None
-        elif event.type == "guardrail_tripped":
-            base_event["guardrail_results"] = [
-                {"name": result.guardrail.name} for result in event.guardrail_results
-            ]
-        elif event.type == "raw_model_event":
-            # event.data thường là object có .type và payload (dict-like)
-            raw = event.data
-            base_event["raw_model_event"] = {"type": raw.type}
-            
-            if getattr(raw, "type", None) == "raw_server_event":
-                payload = self.unwrap_data(getattr(raw, "data", None))  # payload cuối cùng dạng dict
- 
-                if payload and payload.get("type") == "response.output_text.done":
-                    base_event["type"] = "response.output_text.done"
-                    base_event["transcript"] = payload.get("text", "")
-                pass
-            # cố gắng trích transcript theo vài pattern phổ biến
-            data = getattr(raw, "data", None) or getattr(raw, "message", None) or raw
-            # nếu data là dict-like:
-            if isinstance(data, dict):
-                # 1) transcript ở top-level
-                if "transcript" in data:
-                    base_event["raw_model_event"]["transcript"] = data["transcript"]
-
-                # 2) transcript nằm trong item/content
-                item = data.get("item") or data.get("conversation_item")
-                if isinstance(item, dict):
-                    content = item.get("content")
-                    if isinstance(content, list):
-                        for part in content:
-                            if isinstance(part, dict) and "transcript" in part:
-                                base_event["raw_model_event"]["transcript"] = part["transcript"]
-                                break
-        elif event.type == "error":
-            base_event["error"] = str(event.error) if hasattr(event, "error") else "Unknown error"
-        elif event.type == "input_audio_timeout_triggered":
-            pass
-        else:
-            assert_never(event)
-
-        return base_event
-
+    async def _serialize_event(self, event: RealtimeSessionEvent) -> tuple[dict[str, Any], Optional[str]]:
+        """Return the client dict for an event and, for response.output_text.done, its text."""
+        # Same per-type serializers and cached history sanitizer as the main server
+        event_data = EventSerializer.serialize(event)
+        if event_data["type"] == "response.output_text.done":
+            return event_data, event_data.get("transcript")
+        return event_data, None
 
 manager = RealtimeWebSocketManager()
 
@@ -456,13 +452,18 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
     try:
         while True:
             data = await websocket.receive_text()
-            message = json.loads(data)
+            message = orjson.loads(data)
 
             if message["type"] == "audio":
-                # Convert int16 array to bytes
-                int16_data = message["data"]
-                audio_bytes = struct.pack(f"{len(int16_data)}h", *int16_data)
+                # Convert int16 array to little-endian PCM bytes in one C-level pass
+                pcm = array.array("h", message["data"])
+                if sys.byteorder != "little":
+                    pcm.byteswap()
+                audio_bytes = pcm.tobytes()
                 await manager.send_audio(session_id, audio_bytes)
+            elif message["type"] == "audio_b64":
+                # Base64 int16 LE PCM: one bulk decode, no per-sample JSON numbers
+                await manager.send_audio(session_id, base64.b64decode(message["b64"]))
             elif message["type"] == "image":
                 logger.info("Received image message from client (session %s).", session_id)
                 # Build a conversation.item.create with input_image (and optional input_text)
@@ -487,61 +488,61 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
                     }
                     await manager.send_user_message(session_id, user_msg)
                     # Acknowledge to client UI
-                    await websocket.send_text(
-                        json.dumps(
-                            {
-                                "type": "client_info",
-                                "info": "image_enqueued",
-                                "size": len(data_url),
-                            }
-                        )
-                    )
+                    await manager.send_event(session_id, {
+                        "type": "client_info",
+                        "info": "image_enqueued",
+                        "size": len(data_url),
+                    })
                 else:
-                    await websocket.send_text(
-                        json.dumps(
-                            {
-                                "type": "error",
-                                "error": "No data_url for image message.",
-                            }
-                        )
-                    )
+                    await manager.send_event(session_id, {
+                        "type": "error",
+                        "error": "No data_url for image message.",
+                    })
             elif message["type"] == "commit_audio":
                 # Force close the current input audio turn
                 await manager.send_client_event(session_id, {"type": "input_audio_buffer.commit"})
             elif message["type"] == "image_start":
                 img_id = str(message.get("id"))
+                if img_id not in image_buffers and len(image_buffers) >= _MAX_PENDING_IMAGES:
+                    # dicts keep insertion order, so the first key is the oldest upload
+                    del image_buffers[next(iter(image_buffers))]
                 image_buffers[img_id] = {
                     "text": message.get("text") or "Please describe this image.",
-                    "chunks": [],
+                    # data_url text accumulates in one growing buffer; no per-chunk str kept, no final join
+                    "data": bytearray(),
+                    "count": 0,
+                    "last_ack": time.monotonic(),
                 }
-                await websocket.send_text(
-                    json.dumps({"type": "client_info", "info": "image_start_ack", "id": img_id})
+                await manager.send_event(
+                    session_id, {"type": "client_info", "info": "image_start_ack", "id": img_id}
                 )
             elif message["type"] == "image_chunk":
                 img_id = str(message.get("id"))
                 chunk = message.get("chunk", "")
-                if img_id in image_buffers:
-                    image_buffers[img_id]["chunks"].append(chunk)
-                    if len(image_buffers[img_id]["chunks"]) % 10 == 0:
-                        await websocket.send_text(
-                            json.dumps(
-                                {
-                                    "type": "client_info",
-                                    "info": "image_chunk_ack",
-                                    "id": img_id,
-                                    "count": len(image_buffers[img_id]["chunks"]),
-                                }
-                            )
-                        )
+                buf = image_buffers.get(img_id)
+                if buf is not None:
+                    buf["data"] += chunk.encode()
+                    buf["count"] += 1
+                    # Progress acks are throttled in time, not per N chunks, so a fast upload
+                    # isn't held up by an ack send between its chunks
+                    now = time.monotonic()
+                    if now - buf["last_ack"] >= _IMAGE_ACK_INTERVAL:
+                        buf["last_ack"] = now
+                        await manager.send_event(session_id, {
+                            "type": "client_info",
+                            "info": "image_chunk_ack",
+                            "id": img_id,
+                            "count": buf["count"],
+                        })
             elif message["type"] == "image_end":
                 img_id = str(message.get("id"))
                 buf = image_buffers.pop(img_id, None)
                 if buf is None:
-                    await websocket.send_text(
-                        json.dumps({"type": "error", "error": "Unknown image id for image_end."})
+                    await manager.send_event(
+                        session_id, {"type": "error", "error": "Unknown image id for image_end."}
                     )
                 else:
-                    data_url = "".join(buf["chunks"]) if buf["chunks"] else None
+                    data_url = buf["data"].decode() if buf["data"] else None
                     prompt_text = buf["text"]
                     if data_url:
                         logger.info(
@@ -567,35 +568,30 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
                             ),
                         }
                         await manager.send_user_message(session_id, user_msg2)
-                        await websocket.send_text(
-                            json.dumps(
-                                {
-                                    "type": "client_info",
-                                    "info": "image_enqueued",
-                                    "id": img_id,
-                                    "size": len(data_url),
-                                }
-                            )
-                        )
+                        await manager.send_event(session_id, {
+                            "type": "client_info",
+                            "info": "image_enqueued",
+                            "id": img_id,
+                            "size": len(data_url),
+                        })
                     else:
-                        await websocket.send_text(
-                            json.dumps({"type": "error", "error": "Empty image."})
+                        await manager.send_event(
+                            session_id, {"type": "error", "error": "Empty image."}
                         )
             elif message["type"] == "interrupt":
                 await manager.interrupt(session_id)
 
     except WebSocketDisconnect:
         await manager.disconnect(session_id)
+    finally:
+        # Drop partial uploads now instead of whenever the handler frame is collected
+        image_buffers.clear()
 
 
+# html=True serves static/index.html for "/", so no separate index route is needed.
 app.mount("/", StaticFiles(directory="static", html=True), name="static")
 
 
-@app.get("/")
-async def read_index():
-    return FileResponse("static/index.html")
-
-
 @app.post("/api/tts/enable")
 async def enable_cartesia_tts(
     model_id: str = "sonic-3",
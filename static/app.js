@@ -18,6 +18,7 @@ class RealtimeDemo {
         this.playbackFadeSec = 0.02; // ~20ms fade to reduce clicks
         this.messageNodes = new Map(); // item_id -> DOM node
         this.seenItemIds = new Set(); // item_id set for append-only syncing
+        this.textDecoder = new TextDecoder(); // binary audio frame headers
 
         this.initializeElements();
         this.setupEventListeners();
@@ -165,6 +166,8 @@ class RealtimeDemo {
             this.ws.onopen = async () => {
                 this.isConnected = true;
                 this.updateConnectionUI();
+                // Server-side TTS is opt-in per session; this UI plays it back.
+                this.ws.send(JSON.stringify({ type: 'enable_tts', enabled: true }));
                 await this.startContinuousCapture();
                 if (this.vadManager && this.stream) {
                     this.vadManager.start(this.stream);
@@ -173,14 +176,29 @@ class RealtimeDemo {
 
             this.ws.onmessage = (event) => {
                 if (event.data instanceof ArrayBuffer) {
+                    // Binary frame: [u32 LE header length][JSON header][PCM16]; TTS chunks have no header.
+                    const headerLen = new DataView(event.data).getUint32(0, true);
+                    const int16Array = new Int16Array(event.data, 4 + headerLen);
+                    if (headerLen > 0) {
+                        const header = JSON.parse(this.textDecoder.decode(new Uint8Array(event.data, 4, headerLen)));
+                        this.handleRealtimeEvent(header);
+                        if (header.type === 'audio') {
+                            this.playAudioRaw(int16Array);
+                        }
+                        return;
+                    }
                     if (this.ignoreIncomingAudio) {
                         return;
                     }
-                    const int16Array = new Int16Array(event.data);
                     this.playAudioRaw(int16Array);
                     return;
                 }
                 const data = JSON.parse(event.data);
+                // Events queued together arrive as one JSON array frame.
+                if (Array.isArray(data)) {
+                    data.forEach((item) => this.handleRealtimeEvent(item));
+                    return;
+                }
                 this.handleRealtimeEvent(data);
             };
 
@@ -288,10 +306,8 @@ class RealtimeDemo {
                 const chunk = event.data instanceof ArrayBuffer ? new Int16Array(event.data) : event.data;
                 if (!chunk || !(chunk instanceof Int16Array) || chunk.length === 0) return;
 
-                this.ws.send(JSON.stringify({
-                    type: 'audio',
-                    data: Array.from(chunk)
-                }));
+                // Raw little-endian PCM16 in a binary frame; the server forwards it without parsing.
+                this.ws.send(chunk);
             };
 
             this.captureSource.connect(this.captureNode);
@@ -343,11 +359,18 @@ class RealtimeDemo {
             this.addToolEvent(event);
         }
 
+        // Metrics and interruption ride on the triggering event's frame.
+        if (event.metrics) {
+            this.updateMetrics(event.metrics);
+        }
+        if (event.interrupted) {
+            console.log('Interruption event received:', event.type);
+            this.updateStatus('Listening...', 'listening');
+            this.stopAudioPlayback();
+        }
+
         // Handle specific event types
         switch (event.type) {
-            case 'audio':
-                this.playAudio(event.audio);
-                break;
             case 'audio_interrupted':
             case 'input_audio_buffer.speech_started':
                 console.log('Interruption event received:', event.type);
@@ -363,6 +386,12 @@ class RealtimeDemo {
                 this.syncMissingFromHistory(event.history);
                 this.updateLastMessageFromHistory(event.history);
                 break;
+            case 'history_delta':
+                // Only items that changed in place or were appended since the last update.
+                for (const item of [...(event.updated || []), ...(event.added || [])]) {
+                    this.updateMessageFromItem(item);
+                }
+                break;
             case 'history_added':
                 // Append just the new item without clearing the thread.
                 if (event.item) {
@@ -434,10 +463,10 @@ class RealtimeDemo {
             }
         };
 
-        if (data.tts) updateField('metric-tts', data.tts);
-        if (data.llm) updateField('metric-llm', data.llm);
-        if (data.stt) updateField('metric-stt', data.stt);
-        if (data.turn) updateField('metric-turn', data.turn);
+        if (data.tts !== undefined) updateField('metric-tts', data.tts);
+        if (data.llm !== undefined) updateField('metric-llm', data.llm);
+        if (data.stt !== undefined) updateField('metric-stt', data.stt);
+        if (data.turn !== undefined) updateField('metric-turn', data.turn);
         if (data.input_tokens !== undefined) updateField('metric-input_tokens', data.input_tokens);
         if (data.output_tokens !== undefined) updateField('metric-output_tokens', data.output_tokens);
         if (data.cost) updateField('metric-cost', data.cost, true);
@@ -451,12 +480,17 @@ class RealtimeDemo {
             if (it && it.type === 'message') { last = it; break; }
         }
         if (!last) return;
-        const itemId = last.item_id;
+        this.updateMessageFromItem(last);
+    }
+
+    updateMessageFromItem(item) {
+        if (!item || item.type !== 'message') return;
+        const itemId = item.item_id;
 
         // Extract a text representation (for assistant transcript updates)
         let text = '';
-        if (Array.isArray(last.content)) {
-            for (const part of last.content) {
+        if (Array.isArray(item.content)) {
+            for (const part of item.content) {
                 if (!part || typeof part !== 'object') continue;
                 if (part.type === 'text' && part.text) text += part.text;
                 else if (part.type === 'input_text' && part.text) text += part.text;
@@ -467,7 +501,7 @@ class RealtimeDemo {
         const node = this.messageNodes.get(itemId);
         if (!node) {
             // If we haven't rendered this item yet, append it now.
-            this.addMessageFromItem(last);
+            this.addMessageFromItem(item);
             return;
         }
 
@@ -662,27 +696,6 @@ class RealtimeDemo {
         this.toolsContent.scrollTop = this.toolsContent.scrollHeight;
     }
 
-    async playAudio(audioBase64) {
-        try {
-            if (!audioBase64 || audioBase64.length === 0) {
-                console.warn('Received empty audio data, skipping playback');
-                return;
-            }
-
-            const int16Array = this.decodeBase64ToInt16(audioBase64);
-            if (!int16Array || int16Array.length === 0) {
-                console.warn('Audio chunk has no samples, skipping');
-                return;
-            }
-
-            await this.playAudioRaw(int16Array);
-
-        } catch (error) {
-            console.error('Failed to play audio:', error);
-            this.pendingPlaybackChunks = [];
-        }
-    }
-
     async playAudioRaw(int16Array) {
         try {
             this.pendingPlaybackChunks.push(int16Array);
@@ -762,21 +775,6 @@ class RealtimeDemo {
         }
     }
 
-    decodeBase64ToInt16(audioBase64) {
-        try {
-            const binaryString = atob(audioBase64);
-            const length = binaryString.length;
-            const bytes = new Uint8Array(length);
-            for (let i = 0; i < length; i++) {
-                bytes[i] = binaryString.charCodeAt(i);
-            }
-            return new Int16Array(bytes.buffer);
-        } catch (error) {
-            console.error('Failed to decode audio chunk:', error);
-            return null;
-        }
-    }
-
     stopAudioPlayback() {
         console.log('Stopping audio playback due to interruption');
 
@@ -0,0 +1,10 @@
+import os
+import sys
+from pathlib import Path
+
+# agent.ws.manager refuses to import without these; tests never reach the real services.
+os.environ.setdefault("AZURE_OPENAI_API_KEY", "test")
+os.environ.setdefault("AZURE_OPENAI_REALTIME_URL", "wss://example.invalid/openai/v1/realtime")
+os.environ.setdefault("CARTESIA_API_KEY", "test")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,92 @@
+"""Binary audio frame format shared with static/app.js: [u32 LE header_len][JSON header][PCM16]."""
+import array
+import struct
+
+import orjson
+import pytest
+
+from agent.ws.connection import OutgoingMessage
+from agent.ws.manager import _merge_pcm_frames, encode_audio_frame
+
+
+def parse_frame(frame) -> tuple[dict | None, bytes, int]:
+    """Decode a frame the way the browser client does; returns (header, pcm, pcm offset)."""
+    frame = bytes(frame)
+    (header_len,) = struct.unpack_from("<I", frame, 0)
+    header = orjson.loads(frame[4:4 + header_len]) if header_len else None
+    return header, frame[4 + header_len:], 4 + header_len
+
+
+def pcm16(*samples: int) -> bytes:
+    return struct.pack(f"<{len(samples)}h", *samples)
+
+
+def test_header_round_trips():
+    header = {"type": "audio", "item_id": "item_1", "content_index": 0}
+    pcm = pcm16(0, 1, -1, 32767, -32768)
+
+    parsed_header, parsed_pcm, _ = parse_frame(encode_audio_frame(pcm, header))
+
+    assert parsed_header == header
+    assert parsed_pcm == pcm
+
+
+def test_tts_frame_has_empty_header():
+    pcm = pcm16(5, 6, 7)
+
+    frame = encode_audio_frame(pcm)
+
+    assert frame[:4] == b"\x00\x00\x00\x00"
+    assert parse_frame(frame) == (None, pcm, 4)
+
+
+@pytest.mark.parametrize("item_id", ["a", "ab", "abc", "abcd"])
+def test_header_padding_keeps_pcm_aligned(item_id):
+    # Consecutive id lengths cover both odd and even raw JSON header lengths.
+    header = {"type": "audio", "item_id": item_id, "content_index": 0}
+    pcm = pcm16(-2, -1, 0, 1, 2)
+
+    frame = encode_audio_frame(pcm, header)
+    parsed_header, parsed_pcm, offset = parse_frame(frame)
+
+    assert offset % 2 == 0
+    assert parsed_header == header
+    # The client views the PCM as an Int16Array starting at the offset.
+    samples = array.array("h")
+    samples.frombytes(parsed_pcm)
+    assert samples.tolist() == [-2, -1, 0, 1, 2]
+
+
+def test_encode_accepts_memoryview():
+    pcm = memoryview(array.array("h", [3, -3]))
+
+    assert parse_frame(encode_audio_frame(pcm))[1] == pcm16(3, -3)
+
+
+def test_merge_keeps_header_less_frames_in_order():
+    chunks = [pcm16(1, 2), pcm16(3), pcm16(4, 5, 6)]
+    frames = [OutgoingMessage(kind="bytes", data=encode_audio_frame(chunk)) for chunk in chunks]
+    buf = bytearray()
+
+    merged = _merge_pcm_frames(frames, buf)
+
+    assert parse_frame(merged) == (None, b"".join(chunks), 4)
+
+
+def test_merge_reuses_buffer_for_smaller_bursts():
+    buf = bytearray()
+    big = [OutgoingMessage(kind="bytes", data=encode_audio_frame(pcm16(i, i))) for i in range(4)]
+    merged = _merge_pcm_frames(big, buf)
+    merged.release()
+
+    small = [OutgoingMessage(kind="bytes", data=encode_audio_frame(pcm16(9))) for _ in range(2)]
+    merged = _merge_pcm_frames(small, buf)
+
+    # The stale tail of the earlier burst stays in buf but is outside the returned view.
+    assert parse_frame(merged) == (None, pcm16(9, 9), 4)
+
+
+def test_merge_single_frame_is_sent_as_is():
+    frame = OutgoingMessage(kind="bytes", data=encode_audio_frame(pcm16(1)))
+
+    assert _merge_pcm_frames([frame], bytearray()) is frame.data
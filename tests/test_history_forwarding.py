@@ -0,0 +1,136 @@
+"""RealtimeWebSocketManager._forward_history: which frame a history snapshot turns into."""
+import asyncio
+from types import SimpleNamespace
+from typing import Any, Optional
+
+import orjson
+import pytest
+
+from agent.core.core_types import SessionState
+from agent.ws.manager import _HISTORY_DELTA_MAX, RealtimeWebSocketManager
+
+
+def item(item_id: str, text: str = "") -> dict[str, Any]:
+    return {"item_id": item_id, "type": "message", "role": "assistant", "content": [{"type": "text", "text": text}]}
+
+
+class Harness:
+    """A manager whose sends are recorded instead of queued, with one connection's state."""
+
+    def __init__(self, subscribed: Optional[set[str]] = None, sent: Optional[list[dict]] = None):
+        self.manager = RealtimeWebSocketManager()
+        self.state = SessionState(session_id="s")
+        self.state.subscribed_types = None if subscribed is None else frozenset(subscribed)
+        self.state.sent_history = list(sent or [])
+        self.conn = SimpleNamespace(session_id="s", state=self.state)
+        self.frames: list[dict[str, Any]] = []
+        self.accept = True
+        self.manager.send_texts = self._send_texts
+        self.manager.send_json = self._send_json
+
+    async def _send_texts(self, session_id: str, texts: list[str]) -> bool:
+        if self.accept:
+            self.frames.extend(orjson.loads(text) for text in texts)
+        return self.accept
+
+    async def _send_json(self, session_id: str, payload: dict[str, Any], *, drop_if_full: bool = False) -> bool:
+        if self.accept:
+            self.frames.append(payload)
+        return self.accept
+
+    def forward(self, history: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        self.frames = []
+        asyncio.run(self.manager._forward_history(self.conn, history))
+        return self.frames
+
+
+def test_pure_append_is_sent_as_history_added():
+    h = Harness(sent=[item("a")])
+    history = [item("a"), item("b"), item("c")]
+
+    frames = h.forward(history)
+
+    assert frames == [{"type": "history_added", "item": item("b")}, {"type": "history_added", "item": item("c")}]
+    assert h.state.sent_history == history
+
+
+def test_unchanged_snapshot_sends_nothing():
+    h = Harness(sent=[item("a"), item("b")])
+
+    assert h.forward([item("a"), item("b")]) == []
+
+
+def test_in_place_rewrite_is_sent_as_history_delta():
+    h = Harness(sent=[item("a"), item("b")])
+    history = [item("a", "transcript"), item("b"), item("c")]
+
+    frames = h.forward(history)
+
+    assert frames == [{"type": "history_delta", "updated": [item("a", "transcript")], "added": [item("c")]}]
+    assert h.state.sent_history == history
+
+
+def test_rewrite_with_a_different_item_id_falls_back_to_snapshot():
+    h = Harness(sent=[item("a"), item("b")])
+    history = [item("x"), item("b")]
+
+    assert h.forward(history) == [{"type": "history_updated", "history": history}]
+    assert h.state.sent_history == history
+
+
+def test_too_many_rewritten_items_fall_back_to_snapshot():
+    count = _HISTORY_DELTA_MAX + 1
+    h = Harness(sent=[item(str(i)) for i in range(count)])
+    history = [item(str(i), "changed") for i in range(count)]
+
+    assert h.forward(history) == [{"type": "history_updated", "history": history}]
+
+
+def test_too_many_appended_items_fall_back_to_snapshot():
+    h = Harness()
+    history = [item(str(i)) for i in range(_HISTORY_DELTA_MAX + 1)]
+
+    assert h.forward(history) == [{"type": "history_updated", "history": history}]
+
+
+def test_removed_items_fall_back_to_snapshot():
+    h = Harness(sent=[item("a"), item("b")])
+
+    assert h.forward([item("b")]) == [{"type": "history_updated", "history": [item("b")]}]
+    assert h.state.sent_history == [item("b")]
+
+
+def test_unsubscribed_history_added_falls_back_to_snapshot():
+    h = Harness(subscribed={"history_updated"}, sent=[item("a")])
+    history = [item("a"), item("b")]
+
+    assert h.forward(history) == [{"type": "history_updated", "history": history}]
+    assert h.state.sent_history == history
+
+
+def test_unsubscribed_history_delta_falls_back_to_snapshot():
+    h = Harness(subscribed={"history_updated", "history_added"}, sent=[item("a")])
+    history = [item("a", "transcript")]
+
+    assert h.forward(history) == [{"type": "history_updated", "history": history}]
+
+
+@pytest.mark.parametrize(
+    "sent, history",
+    [
+        pytest.param([item("a")], [item("a"), item("b")], id="history_added"),
+        pytest.param([item("a")], [item("a", "transcript")], id="history_delta"),
+        pytest.param([item("a")], [item("x")], id="history_updated"),
+    ],
+)
+def test_sent_history_only_advances_after_a_successful_send(sent, history):
+    h = Harness(sent=sent)
+    h.accept = False
+
+    h.forward(history)
+
+    assert h.state.sent_history == sent
+    # Once the client catches up, the same snapshot is diffed against what it really has.
+    h.accept = True
+    assert h.forward(history)
+    assert h.state.sent_history == history